@@ -0,0 +1,37 @@
+#! /usr/bin/env python3
+"""
+Benchmark the playing strength of RAVE against plain UCT, at equal simulation counts, for each game.
+
+Both players run the same number of simulations per move, so the score isolates what the all-moves-as-first
+statistics bring. The matches are played by the arena, with alternating colours, and reported with an Elo estimate.
+"""
+
+# stdlib imports
+import argparse
+import os
+
+# local imports
+from src.games.game_registry import GAME_FACTORIES
+from src.arena.arena import PlayerSpec, run_arena
+
+
+###############################################################################
+#   Main function to parse arguments and run the benchmark
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark RAVE against plain UCT at equal simulations.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--games", "-g", nargs="+", choices=list(GAME_FACTORIES), default=list(GAME_FACTORIES), help="Games to benchmark.")
+    parser.add_argument("--simulations", "-sim", type=int, default=200, help="Number of simulations per move, for both players.")
+    parser.add_argument("--rave_k", type=float, default=500.0, help="RAVE equivalence parameter.")
+    parser.add_argument("--matches", "-n", type=int, default=40, help="Number of games per match.")
+    parser.add_argument("--processes", "-p", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the matches.")
+    args = parser.parse_args()
+
+    spec_rave = PlayerSpec("mcts", {"simulations": args.simulations, "rave_k": args.rave_k})
+    spec_uct = PlayerSpec("mcts", {"simulations": args.simulations})
+    print(f"RAVE: {spec_rave}")
+    print(f"UCT: {spec_uct}")
+    for game_name in args.games:
+        summary = run_arena(game_name, spec_rave, spec_uct, args.matches, processes=args.processes, seed=args.seed)
+        print(f"{game_name:10s} RAVE vs UCT: {summary.tally}")
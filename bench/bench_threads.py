@@ -0,0 +1,59 @@
+#! /usr/bin/env python3
+"""
+Benchmark the shared-tree multi-threaded MCTS: simulations per second against the number of threads, for each game.
+
+On a free-threaded CPython build (e.g. python3.13t) the playouts run in parallel and the rate scales with the threads.
+On a GIL build it shows the overhead of the threads and the shared tree lock.
+"""
+
+# stdlib imports
+import argparse
+import sys
+import time
+
+# local imports
+from src.bases.types import PlayerID
+from src.bases.base_game import BaseGame
+from src.games.game_registry import GAME_FACTORIES
+from src.players.player_mtcs import PlayerMCTS
+
+
+###############################################################################
+#   Benchmark
+#
+def simulations_per_second(game: BaseGame, threads: int, simulations: int, seed: int) -> float:
+    """Runs one search from the game state, and returns the number of simulations per second."""
+    player = PlayerMCTS(PlayerID(game.current_player), simulations=simulations, seed=seed, threads=threads)
+    time_start = time.perf_counter()
+    player.get_move(game)
+    time_elapsed = time.perf_counter() - time_start
+    return simulations / time_elapsed
+
+
+###############################################################################
+#   Main function to parse arguments and run the benchmark
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the simulations per second of multi-threaded MCTS.", formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--games", "-g", nargs="+", choices=list(GAME_FACTORIES), default=list(GAME_FACTORIES), help="Games to benchmark.")
+    parser.add_argument("--threads", "-t", nargs="+", type=int, default=[1, 2, 4, 8], help="Thread counts to benchmark.")
+    parser.add_argument("--simulations", "-sim", type=int, default=2000, help="Number of simulations per search.")
+    parser.add_argument("--seed", type=int, default=123, help="Random seed for reproducibility.")
+    args = parser.parse_args()
+
+    # sys._is_gil_enabled() only exists since python 3.13
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled else 'disabled'}")
+    print(f"{'game':<10} {'threads':>7} {'sims/sec':>10} {'speedup':>8}")
+
+    for game_name in args.games:
+        game = GAME_FACTORIES[game_name]()
+
+        base_rate: float | None = None
+        for thread_count in args.threads:
+            rate = simulations_per_second(game, thread_count, args.simulations, args.seed)
+            if base_rate is None:
+                base_rate = rate
+            print(f"{game_name:<10} {thread_count:>7} {rate:>10.1f} {rate / base_rate:>7.2f}x")
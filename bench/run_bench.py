@@ -0,0 +1,222 @@
+#! /usr/bin/env python3
+"""
+Benchmark suite for the game engines and the MCTS player.
+
+For each game it measures:
+- the raw throughput of make_move, apply_move/undo_move, get_legal_moves and get_winner
+- the random playouts per second, as played by PlayerMCTS
+- the PlayerMCTS simulations per second at several budgets
+- the peak memory per tree node, for each tree storage
+
+The results are written to a JSON file. With --compare, they are checked against a saved baseline,
+and any metric worse than the baseline by more than the threshold is reported as a regression.
+"""
+
+# stdlib imports
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+# local imports
+from src.bases.types import PlayerID
+from src.bases.base_game import BaseGame
+from src.games.game_registry import GAME_FACTORIES
+from src.players.player_mtcs import MCTSNode, PlayerMCTS
+
+###############################################################################
+#   Measurement helpers
+#
+def sample_positions(game_factory: Callable[[], BaseGame], count: int, seed: int) -> List[BaseGame]:
+    """Returns `count` non-terminal positions taken from random games."""
+    rnd_generator = random.Random(seed)
+    positions: List[BaseGame] = []
+    while len(positions) < count:
+        game = game_factory()
+        while not game.is_game_over() and len(positions) < count:
+            positions.append(game)
+            game = game.make_move(rnd_generator.choice(game.get_legal_moves()))
+    return positions
+
+
+def measure_rate(run_batch: Callable[[], int], min_time: float) -> float:
+    """Calls `run_batch`, which returns the number of operations it did, until `min_time` seconds have passed. Returns the operations per second."""
+    operation_count = 0
+    time_start = time.perf_counter()
+    while True:
+        operation_count += run_batch()
+        time_elapsed = time.perf_counter() - time_start
+        if time_elapsed >= min_time:
+            return operation_count / time_elapsed
+
+
+###############################################################################
+#   Benchmarks
+#
+def bench_engine(positions: List[BaseGame], min_time: float) -> Dict[str, float]:
+    """Measures the throughput of the game engine primitives over the sampled positions."""
+    moves = [position.get_legal_moves()[0] for position in positions]
+    scratch_positions = [position.copy() for position in positions]
+
+    def run_make_move() -> int:
+        for position, move in zip(positions, moves):
+            position.make_move(move)
+        return len(positions)
+
+    def run_apply_undo_move() -> int:
+        for position, move in zip(scratch_positions, moves):
+            position.apply_move(move)
+            position.undo_move()
+        return len(positions)
+
+    # The positions cache their legal moves and winner, and Othello its moves mask, which both computations
+    # start from: the caches are cleared before each call, so that the moves are really generated
+    def run_get_legal_moves() -> int:
+        for position in positions:
+            position._clear_cache()
+            position._generate_legal_moves()
+        return len(positions)
+
+    def run_get_winner() -> int:
+        for position in positions:
+            position._clear_cache()
+            position._compute_winner()
+        return len(positions)
+
+    return {
+        "make_move_per_sec": measure_rate(run_make_move, min_time),
+        "apply_undo_move_per_sec": measure_rate(run_apply_undo_move, min_time),
+        "get_legal_moves_per_sec": measure_rate(run_get_legal_moves, min_time),
+        "get_winner_per_sec": measure_rate(run_get_winner, min_time),
+    }
+
+
+def bench_playouts(game_factory: Callable[[], BaseGame], min_time: float, seed: int) -> Dict[str, float]:
+    """Measures the random playouts per second from the initial position."""
+    player = PlayerMCTS(PlayerID(1), seed=seed)
+    game = game_factory()
+
+    def run_playout() -> int:
+        player._simulate(game)
+        return 1
+
+    return {"playouts_per_sec": measure_rate(run_playout, min_time)}
+
+
+def bench_mcts(game_factory: Callable[[], BaseGame], budgets: List[int], min_time: float, seed: int) -> Dict[str, float]:
+    """
+    Measures the PlayerMCTS simulations per second from the initial position, for each simulation budget.
+    After a warmup search, the position is searched again until `min_time` seconds have passed, and the simulations
+    are counted from the search statistics, as the solver may stop a search before its budget is spent.
+    """
+    results: Dict[str, float] = {}
+    for simulations in budgets:
+        game = game_factory()
+        player = PlayerMCTS(PlayerID(game.current_player), simulations=simulations, seed=seed)
+        player.get_move(game)
+
+        def run_search() -> int:
+            player.get_move(game)
+            assert player.last_stats is not None
+            return player.last_stats.simulations
+
+        results[f"mcts_{simulations}_sims_per_sec"] = measure_rate(run_search, min_time)
+    return results
+
+
+def bench_memory(game_factory: Callable[[], BaseGame], simulations: int, seed: int) -> Dict[str, float]:
+    """Measures the peak memory per tree node of one search, for each tree storage."""
+    results: Dict[str, float] = {}
+    for tree_storage in ["object", "array"]:
+        game = game_factory()
+        player = PlayerMCTS(PlayerID(game.current_player), simulations=simulations, seed=seed, tree_storage=tree_storage)
+        tracemalloc.start()
+        if tree_storage == "array":
+            node_count = player._search_array(game, simulations).size
+        else:
+            root = MCTSNode(game)
+            player._search_tree(root, simulations)
+            node_count = root.count_nodes()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"{tree_storage}_tree_bytes_per_node"] = peak_memory / node_count
+    return results
+
+
+###############################################################################
+#   Comparison against a baseline
+#
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Returns a description of each metric worse than the baseline by more than `threshold` (a fraction).
+    Rates (*_per_sec) are better when higher, memory (*_bytes_per_node) when lower.
+    """
+    regressions: List[str] = []
+    for game_name, game_metrics in results["games"].items():
+        baseline_metrics = baseline.get("games", {}).get(game_name, {})
+        for metric_name, value in game_metrics.items():
+            baseline_value = baseline_metrics.get(metric_name)
+            if not baseline_value:
+                continue
+            change = (value - baseline_value) / baseline_value
+            is_regression = change < -threshold if metric_name.endswith("_per_sec") else change > threshold
+            if is_regression:
+                regressions.append(f"{game_name}.{metric_name}: {baseline_value:.1f} -> {value:.1f} ({change:+.1%})")
+    return regressions
+
+
+###############################################################################
+#   Main function to parse arguments and run the benchmarks
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the game engines and the MCTS player.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--games", "-g", nargs="+", choices=list(GAME_FACTORIES.keys()), default=list(GAME_FACTORIES.keys()), help="Games to benchmark.")
+    parser.add_argument("--budgets", nargs="+", type=int, default=[100, 1000], help="MCTS simulation budgets to benchmark.")
+    parser.add_argument("--memory_simulations", type=int, default=2000, help="Number of simulations of the search measuring memory per node.")
+    parser.add_argument("--positions", type=int, default=200, help="Number of sampled positions for the engine benchmarks.")
+    parser.add_argument("--min_time", type=float, default=0.5, help="Minimum duration of each throughput measurement, in seconds.")
+    parser.add_argument("--output", "-o", default="bench_results.json", help="JSON file to write the results to.")
+    parser.add_argument("--compare", "-c", help="Baseline JSON file to compare the results against.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change against the baseline reported as a regression.")
+    parser.add_argument("--seed", type=int, default=123, help="Random seed for reproducibility.")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "games": {},
+    }
+    for game_name in args.games:
+        game_factory = GAME_FACTORIES[game_name]
+        print(f"Benchmarking {game_name}...")
+        game_metrics: Dict[str, float] = {}
+        game_metrics.update(bench_engine(sample_positions(game_factory, args.positions, args.seed), args.min_time))
+        game_metrics.update(bench_playouts(game_factory, args.min_time, args.seed))
+        game_metrics.update(bench_mcts(game_factory, args.budgets, args.min_time, args.seed))
+        game_metrics.update(bench_memory(game_factory, args.memory_simulations, args.seed))
+        results["games"][game_name] = game_metrics
+        for metric_name, value in game_metrics.items():
+            print(f"  {metric_name:<32} {value:>14.1f}")
+
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regression against {args.compare}")
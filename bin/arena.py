@@ -0,0 +1,58 @@
+#! /usr/bin/env python3
+"""
+Headless arena: plays many games between two players in a pool of processes, without rendering the boards.
+
+Colours alternate between games, each game result is streamed to a JSONL file, and the summary reports
+the win/draw/loss counts of player A with an Elo estimate. With --sprt, the run stops as soon as a
+sequential probability ratio test decides whether A is stronger than B.
+
+Example:
+    ./bin/arena.py --game connect4 --player_a "mcts:simulations=400,c_param=1.0" --player_b "mcts:simulations=400" --games 200 --sprt
+"""
+
+# stdlib imports
+import argparse
+import os
+
+# local imports
+from src.games.game_registry import GAME_FACTORIES
+from src.arena.arena import ArenaGameResult, parse_player_spec, run_arena
+from src.arena.elo import SPRT, MatchTally
+
+
+###############################################################################
+#   Main function to parse arguments and run the arena
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a headless match between two AI players.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--game", "-g", choices=list(GAME_FACTORIES), default="connect4", help="Game to play.")
+    parser.add_argument("--player_a", "-a", default="mcts:simulations=200", help='Player A, e.g. "random" or "mcts:simulations=200,c_param=1.0".')
+    parser.add_argument("--player_b", "-b", default="random", help="Player B, same format as player A.")
+    parser.add_argument("--games", "-n", type=int, default=100, help="Maximum number of games to play.")
+    parser.add_argument("--processes", "-p", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--output", "-o", help="JSONL file to append the result of each game to.")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducibility.")
+    parser.add_argument("--sprt", action="store_true", help="Stop early once the SPRT accepts a hypothesis.")
+    parser.add_argument("--elo0", type=float, default=0.0, help="SPRT null hypothesis: A is elo0 stronger than B.")
+    parser.add_argument("--elo1", type=float, default=10.0, help="SPRT alternative hypothesis: A is elo1 stronger than B.")
+    parser.add_argument("--alpha", type=float, default=0.05, help="SPRT false positive rate.")
+    parser.add_argument("--beta", type=float, default=0.05, help="SPRT false negative rate.")
+    args = parser.parse_args()
+
+    spec_a = parse_player_spec(args.player_a)
+    spec_b = parse_player_spec(args.player_b)
+    sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta) if args.sprt else None
+
+    def print_result(result: ArenaGameResult, tally: MatchTally) -> None:
+        colour = "X" if result.a_player_id == 1 else "O"
+        print(f"Game {result.game_index + 1}: A as {colour}, score {result.score}, {result.plies} plies, {result.duration:.2f}s | {tally}")
+
+    print(f"A: {spec_a}")
+    print(f"B: {spec_b}")
+    summary = run_arena(args.game, spec_a, spec_b, args.games, processes=args.processes, seed=args.seed, results_path=args.output, sprt=sprt, on_result=print_result)
+
+    print("\n=== Arena Summary ===")
+    print(summary.tally)
+    if sprt is not None:
+        lower_bound, upper_bound = sprt.bounds
+        print(f"SPRT [{sprt.elo0:+.1f}, {sprt.elo1:+.1f}]: LLR {sprt.llr(summary.tally):.2f} in [{lower_bound:.2f}, {upper_bound:.2f}], verdict: {summary.verdict or 'none'}")
@@ -0,0 +1,96 @@
+#! /usr/bin/env python3
+"""
+Builds an opening book offline, with deep MCTS searches of the first plies of a game.
+
+Starting from the initial position, each position is searched with PlayerMCTS, which merges its results into
+the book, and the `--width` most visited moves are followed until `--plies` plies deep. Positions already in
+the book with enough simulations are not searched again, so an interrupted build can simply be restarted,
+and a rerun with more simulations deepens the existing entries.
+
+Example:
+    ./bin/build_book.py --game connect4 --book connect4_book.sqlite --plies 4 --width 3 --simulations 20000
+"""
+
+# stdlib imports
+import argparse
+import time
+from typing import List, Set
+
+# local imports
+from src.bases.move import Move
+from src.bases.base_game import BaseGame
+from src.book.opening_book import OpeningBook
+from src.games.game_registry import GAME_FACTORIES
+from src.players.player_mtcs import PlayerMCTS
+
+###############################################################################
+#   Book building
+#
+def build_book(game: BaseGame, book_path: str, plies: int, width: int, player: PlayerMCTS) -> int:
+    """Searches the positions up to `plies` plies from `game`, breadth first, and returns the number of positions searched, those answered from the book excluded."""
+    book = OpeningBook(book_path)
+    positions: List[BaseGame] = [game]
+    seen_hashes: Set[int] = {game.zobrist_hash}
+    searched_count = 0
+    try:
+        for ply in range(plies + 1):
+            next_positions: List[BaseGame] = []
+            for position in positions:
+                if position.is_game_over():
+                    continue
+                # The player searches the position, or answers from the book if it is already deep enough
+                player.player_id = position.current_player
+                time_start = time.perf_counter()
+                player.get_move(position)
+                assert player.last_stats is not None
+                if player.last_stats.from_book:
+                    print(f"ply {ply}: position {position.zobrist_hash:016x} already in the book")
+                else:
+                    searched_count += 1
+                    print(f"ply {ply}: position {position.zobrist_hash:016x} searched in {time.perf_counter() - time_start:.2f}s")
+
+                if ply == plies:
+                    continue
+                book_entry = book.lookup(position)
+                assert book_entry is not None
+                move_stats = book_entry.move_stats
+                best_moves = sorted(move_stats, key=lambda move: move_stats[move][0], reverse=True)[:width]
+                for move in best_moves:
+                    next_position = position.make_move(Move.of(move))
+                    if next_position.zobrist_hash not in seen_hashes:
+                        seen_hashes.add(next_position.zobrist_hash)
+                        next_positions.append(next_position)
+            positions = next_positions
+    finally:
+        book.close()
+    return searched_count
+
+
+###############################################################################
+#   Main function to parse arguments and build the book
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an opening book with deep MCTS searches.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--game", "-g", choices=list(GAME_FACTORIES), default="connect4", help="Game to build the book for.")
+    parser.add_argument("--book", "-b", required=True, help="SQLite file of the opening book, created if missing.")
+    parser.add_argument("--plies", type=int, default=4, help="Depth of the book, in plies from the initial position.")
+    parser.add_argument("--width", type=int, default=2, help="Number of most visited moves followed from each position.")
+    parser.add_argument("--simulations", "-sim", type=int, default=20000, help="Number of simulations per position.")
+    parser.add_argument("--exploration", "-exp", type=float, default=1.4, help="Exploration parameter for MCTS.")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Number of processes for root-parallel MCTS.")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducibility.")
+    args = parser.parse_args()
+
+    game = GAME_FACTORIES[args.game]()
+    player = PlayerMCTS(
+        game.current_player,
+        simulations=args.simulations,
+        c_param=args.exploration,
+        workers=args.workers,
+        seed=args.seed,
+        opening_book=args.book,
+        book_plies=args.plies,
+    )
+    searched_count = build_book(game, args.book, args.plies, args.width, player)
+    player.close()
+    print(f"{searched_count} positions searched, book saved to {args.book}")
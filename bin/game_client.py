@@ -0,0 +1,93 @@
+#! /usr/bin/env python3
+"""
+Client stub of the game server: plays many concurrent sessions, a random player against the AI of the server,
+and reports the latency of the AI moves and the requests rejected as busy.
+
+Example:
+    ./bin/game_client.py --port 8765 --sessions 200 --game connect4 --time_budget_ms 200
+"""
+
+# stdlib imports
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+# local imports
+from src.games.game_registry import GAME_FACTORIES
+from src.server.game_client import GameClient
+from src.server.game_server import ServerBusyError
+
+
+###############################################################################
+#   Sessions
+#
+class LoadReport:
+    """Outcome of the sessions played against the server."""
+    def __init__(self):
+        self.games: int = 0
+        self.ai_move_latencies: List[float] = []
+        self.busy_count: int = 0
+
+    def __str__(self) -> str:
+        latencies = sorted(self.ai_move_latencies)
+        if not latencies:
+            return f"{self.games} games, no AI move, {self.busy_count} busy"
+        median = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return f"{self.games} games, {len(latencies)} AI moves, latency median {median * 1000:.0f} ms / p95 {p95 * 1000:.0f} ms, {self.busy_count} busy"
+
+
+async def play_session(host: str, port: int, game_name: str, ai: str | None, time_budget_ms: float, rnd_generator: random.Random, report: LoadReport) -> None:
+    """Plays one game on its own connection: random moves for the client, the server AI for the other side."""
+    client = await GameClient.connect(host, port)
+    try:
+        response = await client.request("new_game", game=game_name, ai=ai)
+        session, state = response["session"], response["state"]
+        client_player = rnd_generator.choice([1, -1])
+        while not state["game_over"]:
+            if state["current_player"] == client_player:
+                state = (await client.request("move", session=session, move=rnd_generator.choice(state["legal_moves"])))["state"]
+                continue
+            time_start = time.perf_counter()
+            try:
+                state = (await client.request("ai_move", session=session, time_budget_ms=time_budget_ms))["state"]
+            except ServerBusyError:
+                report.busy_count += 1
+                await asyncio.sleep(rnd_generator.uniform(0.05, 0.2))
+                continue
+            report.ai_move_latencies.append(time.perf_counter() - time_start)
+        await client.request("close", session=session)
+        report.games += 1
+    finally:
+        await client.close()
+
+
+async def run_sessions(args: argparse.Namespace) -> LoadReport:
+    rnd_generator = random.Random(args.seed)
+    report = LoadReport()
+    await asyncio.gather(*[
+        play_session(args.host, args.port, args.game, args.ai, args.time_budget_ms, random.Random(rnd_generator.getrandbits(64)), report)
+        for _ in range(args.sessions)
+    ])
+    return report
+
+
+###############################################################################
+#   Main function to parse arguments and play the sessions
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play concurrent sessions against the game server.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Address of the server.")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the server.")
+    parser.add_argument("--game", "-g", choices=list(GAME_FACTORIES), default="connect4", help="Game to play.")
+    parser.add_argument("--sessions", "-n", type=int, default=10, help="Number of concurrent sessions.")
+    parser.add_argument("--ai", help='AI of the sessions, e.g. "mcts:c_param=1.0". Defaults to the AI of the server.')
+    parser.add_argument("--time_budget_ms", type=float, default=200.0, help="Time budget of each AI move.")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducibility.")
+    args = parser.parse_args()
+
+    time_start = time.perf_counter()
+    report = asyncio.run(run_sessions(args))
+    print(f"{report} in {time.perf_counter() - time_start:.1f}s")
@@ -0,0 +1,49 @@
+#! /usr/bin/env python3
+"""
+Game server: hosts many concurrent game sessions of any game over TCP, the AI moves being searched in a pool of processes.
+
+The protocol (JSON lines) is described in src/server/game_server.py, and bin/game_client.py plays sessions against the server.
+
+Example:
+    ./bin/game_server.py --port 8765 --processes 4 --ai "mcts:c_param=1.0"
+"""
+
+# stdlib imports
+import argparse
+import asyncio
+import os
+
+# local imports
+from src.server.game_server import GameServer, ServerConfig
+
+
+###############################################################################
+#   Main function to parse arguments and run the server
+#
+if __name__ == "__main__":
+    default_config = ServerConfig()
+    parser = argparse.ArgumentParser(description="Serve game sessions against an AI over TCP.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--processes", "-p", type=int, default=os.cpu_count() or 1, help="Number of worker processes searching the AI moves.")
+    parser.add_argument("--max_queued_searches", type=int, default=default_config.max_queued_searches, help="AI moves waiting for a worker beyond which new ones are rejected as busy.")
+    parser.add_argument("--time_budget_ms", type=float, default=default_config.default_time_budget_ms, help="Time budget of an AI move whose request sets none.")
+    parser.add_argument("--max_time_budget_ms", type=float, default=default_config.max_time_budget_ms, help="Upper bound of the time budget of an AI move.")
+    parser.add_argument("--max_transposition_table_size", type=int, default=default_config.max_transposition_table_size, help="Upper bound of the transposition table size an AI may ask for.")
+    parser.add_argument("--ai", default=default_config.default_ai, help='AI of a new game whose request sets none, e.g. "random" or "mcts:c_param=1.0".')
+    parser.add_argument("--seed", type=int, help="Random seed for reproducibility.")
+    args = parser.parse_args()
+
+    config = ServerConfig(
+        processes=args.processes,
+        max_queued_searches=args.max_queued_searches,
+        default_time_budget_ms=args.time_budget_ms,
+        max_time_budget_ms=args.max_time_budget_ms,
+        default_ai=args.ai,
+        max_transposition_table_size=args.max_transposition_table_size,
+    )
+    print(f"Serving on {args.host}:{args.port} with {args.processes} worker processes")
+    try:
+        asyncio.run(GameServer(config, seed=args.seed).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
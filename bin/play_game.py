@@ -10,12 +10,11 @@ import argparse
 # local imports
 from src.bases.types import PlayerID
 from src.bases.move import Move
-from src.games.game_tictactoe import GameTicTacToe
-from src.games.game_connect4 import GameConnect4
-from src.games.game_othello import GameOthello
+from src.games.game_registry import GAME_FACTORIES
 from src.players.player_human import PlayerHuman
-from src.players.player_mtcs import PlayerMCTS
+from src.players.player_mtcs import JsonlStatsWriter, PlayerMCTS
 from src.players.player_random import PlayerRandom
+from src.rollouts.rollout_policies import ROLLOUT_POLICIES
 from src.bases.base_player import BasePlayer
 from src.bases.base_game import BaseGame
 
@@ -75,6 +74,33 @@ def play_game(game: BaseGame, player1: BasePlayer, player2: BasePlayer) -> int:
     return game_result
 
 
+###############################################################################
+#   Create a MCTS player from the command line arguments
+#
+def create_mcts_player(player_id: PlayerID, args: argparse.Namespace) -> PlayerMCTS:
+    """Creates a MCTS player configured from the parsed command line arguments."""
+    return PlayerMCTS(
+        player_id,
+        simulations=args.simulations,
+        time_budget_ms=args.time_budget_ms,
+        c_param=args.exploration,
+        seed=args.seed,
+        workers=args.workers,
+        rollouts_per_leaf=args.rollouts_per_leaf,
+        playout_backend=args.playout_backend,
+        threads=args.threads,
+        tree_storage=args.tree_storage,
+        transposition_table_size=args.transposition_table_size,
+        reuse_tree=args.reuse_tree,
+        ponder=args.ponder,
+        stats_callback=JsonlStatsWriter(args.stats_log) if args.stats_log else None,
+        opening_book=args.opening_book,
+        book_plies=args.book_plies,
+        rollout_policy=args.rollout_policy,
+        rave_k=args.rave_k,
+    )
+
+
 ###############################################################################
 #   Main function to parse arguments and start the game
 #
@@ -82,20 +108,36 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Play a game of Tic-Tac-Toe, Connect4, or Othello against an AI.", formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
-    parser.add_argument("--game", "-g", choices=["tictactoe", "connect4", "othello"], default="tictactoe", help="Choose the game to play.")
+    parser.add_argument("--game", "-g", choices=list(GAME_FACTORIES), default="tictactoe", help="Choose the game to play.")
     parser.add_argument("--games_per_match", "-gpm", type=int, default=1, help="Number of games to play in a match.")
     parser.add_argument("--first", "-f", choices=["human", "ai", "random"], default="human", help="Choose who plays first.")
     parser.add_argument("--second", "-s", choices=["human", "ai", "random"], default="ai", help="Choose who plays second.")
     parser.add_argument("--simulations", "-sim", type=int, default=1000, help="Number of simulations for MCTS.")
+    parser.add_argument("--time_budget_ms", "-tb", type=float, help="Time budget per move for MCTS, in milliseconds. Overrides the number of simulations.")
     parser.add_argument("--exploration", "-exp", type=float, default=1.4, help="Exploration parameter for MCTS.")
+    parser.add_argument("--rollouts_per_leaf", "-rpl", type=int, default=1, help="Number of random playouts run from each new leaf in MCTS.")
+    parser.add_argument("--playout_backend", choices=["python", "numpy"], default="python", help="How MCTS plays its random playouts. numpy vectorises them for Tic-Tac-Toe and Connect4, which only pays off with --rollouts_per_leaf batches of about 32 playouts or more.")
+    parser.add_argument("--rollout_policy", "-rp", choices=list(ROLLOUT_POLICIES), default="random", help="How MCTS picks the moves of its playouts. heuristic uses every hint of the game, e.g. Connect4 wins and blocks, Othello corners.")
+    parser.add_argument("--rave_k", type=float, default=0.0, help="RAVE equivalence parameter for MCTS, e.g. 500. 0 disables RAVE.")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Number of processes for root-parallel MCTS, or searching the shared tree with --tree_storage shared.")
+    parser.add_argument("--threads", "-t", type=int, default=1, help="Number of threads searching a shared MCTS tree.")
+    parser.add_argument("--tree_storage", choices=["object", "array", "shared"], default="object", help="Storage of the MCTS tree: node objects, compact arrays, or compact arrays in shared memory grown by all the workers.")
+    parser.add_argument("--transposition_table_size", "-tt", type=int, default=0, help="Max number of positions in the MCTS transposition table, 0 to disable it.")
+    parser.add_argument("--reuse_tree", action="store_true", help="Keep the MCTS tree between moves.")
+    parser.add_argument("--ponder", action="store_true", help="Keep searching in the background while the opponent thinks. Implies --reuse_tree.")
+    parser.add_argument("--stats_log", help="JSONL file to append the MCTS search statistics of each move to.")
+    parser.add_argument("--opening_book", help="SQLite opening book consulted by MCTS in the opening, and extended with its searches.")
+    parser.add_argument("--book_plies", type=int, default=8, help="Number of plies from the start for which the opening book is used.")
     parser.add_argument("--seed", type=int, help="Random seed for reproducibility.")
     args = parser.parse_args()  # Example args for testing
+    if args.playout_backend == "numpy" and args.rollouts_per_leaf < 32:
+        print(f"Warning: with --rollouts_per_leaf {args.rollouts_per_leaf}, the numpy playout backend is slower than the python one. It pays off from about 32.")
 
     # init player1
     if args.first == "human":
         player1 = PlayerHuman(PlayerID(1))
     elif args.first == "ai":
-        player1 = PlayerMCTS(PlayerID(1), simulations=args.simulations, c_param=args.exploration, seed=args.seed)
+        player1 = create_mcts_player(PlayerID(1), args)
     elif args.first == "random":
         player1 = PlayerRandom(PlayerID(1))
     else:
@@ -105,7 +147,7 @@ if __name__ == "__main__":
     if args.second == "human":
         player2 = PlayerHuman(PlayerID(-1))
     elif args.second == "ai":
-        player2 = PlayerMCTS(PlayerID(-1), simulations=args.simulations, c_param=args.exploration, seed=args.seed)
+        player2 = create_mcts_player(PlayerID(-1), args)
     elif args.second == "random":
         player2 = PlayerRandom(PlayerID(-1))
     else:
@@ -116,20 +158,16 @@ if __name__ == "__main__":
     match_score = 0
     for game_index in range(game_count):
         # Create a fresh game for each match
-        if args.game == "tictactoe":
-            game = GameTicTacToe()
-        elif args.game == "connect4":
-            game = GameConnect4()
-        elif args.game == "othello":
-            game = GameOthello()
-        else:
-            assert False, "Invalid game choice."
+        game = GAME_FACTORIES[args.game]()
         # start the game
         game_result = play_game(game, player1, player2)
         print(f"Game {game_index + 1}th result: {game_result}")
 
         match_score += game_result
 
+    player1.close()
+    player2.close()
+
     print("\n=== Tournament Summary ===")
     print(f"Total Games Played: {game_count}")
     print(f"Tournament Score: {match_score}")
@@ -0,0 +1,197 @@
+# stdlib imports
+import ast
+import json
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, NamedTuple, Set, Tuple
+
+# local imports
+from src.bases.types import GameResult, PlayerID
+from src.bases.base_game import BaseGame
+from src.bases.base_player import BasePlayer
+from src.games.game_registry import GAME_FACTORIES
+from src.players.player_mtcs import PlayerMCTS
+from src.players.player_random import PlayerRandom
+from src.arena.elo import SPRT, MatchTally
+
+###############################################################################
+#   Player Specs
+#
+class PlayerSpec(NamedTuple):
+    """
+    Picklable description of a player, from which each arena worker builds its own player instances.
+
+    `kind` is "mcts" or "random", and `options` are keyword arguments of the player constructor.
+    """
+    kind: str
+    options: Dict[str, Any]
+
+    def create(self, player_id: PlayerID, seed: int) -> BasePlayer:
+        """Creates a quiet player of this spec, seeded with `seed` unless the options set a seed."""
+        options = {"seed": seed, **self.options}
+        if self.kind == "mcts":
+            return PlayerMCTS(player_id, **options)
+        if self.kind == "random":
+            return PlayerRandom(player_id, verbose=False, **options)
+        raise ValueError(f"Unknown player kind: {self.kind}")
+
+    def __str__(self) -> str:
+        if not self.options:
+            return self.kind
+        return f"{self.kind}:" + ",".join(f"{name}={value}" for name, value in self.options.items())
+
+
+def parse_player_spec(text: str) -> PlayerSpec:
+    """
+    Parses a player spec such as "random" or "mcts:simulations=200,c_param=1.0".
+
+    Option values are read as Python literals when possible, e.g. numbers and booleans, and as strings otherwise.
+    """
+    kind, _, options_text = text.partition(":")
+    if kind not in ("mcts", "random"):
+        raise ValueError(f"Unknown player kind: {kind}")
+    options: Dict[str, Any] = {}
+    for option_text in filter(None, options_text.split(",")):
+        name, separator, value_text = option_text.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid player option, expected name=value: {option_text}")
+        try:
+            options[name] = ast.literal_eval(value_text)
+        except (ValueError, SyntaxError):
+            options[name] = value_text
+    return PlayerSpec(kind, options)
+
+
+###############################################################################
+#   Headless games
+#
+class ArenaGameResult(NamedTuple):
+    """Result of one arena game, from the point of view of player A."""
+    game_index: int
+    a_player_id: PlayerID  # Colour played by A: 1 for X, -1 for O
+    winner: GameResult
+    score: float  # Score of A: 1 for a win, 0.5 for a draw, 0 for a loss
+    plies: int
+    duration: float  # Wall time of the game, in seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+def play_headless_game(game: BaseGame, player_x: BasePlayer, player_o: BasePlayer) -> Tuple[GameResult, int]:
+    """Plays a game to the end without any rendering, and returns the winner and the number of plies played."""
+    players: Dict[int, BasePlayer] = {1: player_x, -1: player_o}
+    plies = 0
+    while not game.is_game_over():
+        move = players[game.current_player].get_move(game)
+        game = game.make_move(move)
+        plies += 1
+    return GameResult(game.get_winner() or 0), plies
+
+
+def play_arena_game(game_name: str, spec_a: PlayerSpec, spec_b: PlayerSpec, game_index: int, seed: int) -> ArenaGameResult:
+    """
+    Plays one arena game, typically in a worker process. Colours alternate with the game index: A plays X in the even games.
+    """
+    rnd_generator = random.Random(seed)
+    a_player_id = PlayerID(1 if game_index % 2 == 0 else -1)
+    player_a = spec_a.create(a_player_id, rnd_generator.getrandbits(64))
+    player_b = spec_b.create(PlayerID(-a_player_id), rnd_generator.getrandbits(64))
+    player_x, player_o = (player_a, player_b) if a_player_id == 1 else (player_b, player_a)
+
+    time_start = time.perf_counter()
+    try:
+        winner, plies = play_headless_game(GAME_FACTORIES[game_name](), player_x, player_o)
+    finally:
+        player_a.close()
+        player_b.close()
+    duration = time.perf_counter() - time_start
+
+    score = 0.5 if winner == 0 else (1.0 if winner == a_player_id else 0.0)
+    return ArenaGameResult(game_index, a_player_id, winner, score, plies, duration)
+
+
+###############################################################################
+#   Arena
+#
+class ArenaSummary(NamedTuple):
+    """Outcome of an arena run."""
+    tally: MatchTally
+    verdict: str | None  # "H1" or "H0" if the SPRT stopped the run, None otherwise
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> None:
+    """
+    Terminates the worker processes of the pool in the middle of their games. A plain shutdown would still
+    wait for the running games to finish, either here or in the exit hook of concurrent.futures.
+    """
+    # ProcessPoolExecutor has no public way to stop its workers before Python 3.14
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+
+
+def run_arena(
+    game_name: str,
+    spec_a: PlayerSpec,
+    spec_b: PlayerSpec,
+    games: int,
+    processes: int = 1,
+    seed: int | None = None,
+    results_path: str | None = None,
+    sprt: SPRT | None = None,
+    on_result: Callable[[ArenaGameResult, MatchTally], None] | None = None,
+) -> ArenaSummary:
+    """
+    Plays up to `games` games of A against B in a pool of `processes` worker processes, alternating the colours.
+
+    Each finished game is appended as one JSON line to `results_path`, if given, and passed to `on_result`
+    along with the running tally. With an `sprt`, the run stops as soon as the test accepts a hypothesis:
+    the games still queued are cancelled and the worker processes are terminated, so the games already running
+    are abandoned. The games finish in any order, but each game is seeded from `seed` and its index,
+    so a seeded run plays the same games whatever the number of processes.
+    """
+    if game_name not in GAME_FACTORIES:
+        raise ValueError(f"Unknown game: {game_name}")
+    base_seed = seed if seed is not None else random.getrandbits(64)
+    tally = MatchTally()
+    verdict: str | None = None
+    results_file = open(results_path, "a") if results_path is not None else None
+
+    # Keep a few games queued per process, so that stopping early wastes little work
+    max_pending = 2 * processes
+    next_game_index = 0
+    pending: Set[Future] = set()
+    executor = ProcessPoolExecutor(max_workers=processes)
+    try:
+        while next_game_index < games or pending:
+            while next_game_index < games and len(pending) < max_pending and verdict is None:
+                game_seed = random.Random(f"{base_seed}:{next_game_index}").getrandbits(64)
+                pending.add(executor.submit(play_arena_game, game_name, spec_a, spec_b, next_game_index, game_seed))
+                next_game_index += 1
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result: ArenaGameResult = future.result()
+                tally.add(result.score)
+                if results_file is not None:
+                    results_file.write(json.dumps(result.to_dict()) + "\n")
+                    results_file.flush()
+                if on_result is not None:
+                    on_result(result, tally)
+
+            if sprt is not None and verdict is None:
+                verdict = sprt.verdict(tally)
+                if verdict is not None:
+                    # The results of the games still queued or running are dropped, the tally is the one the test stopped on
+                    break
+    finally:
+        if verdict is not None:
+            _terminate_workers(executor)
+        executor.shutdown(wait=True, cancel_futures=True)
+        if results_file is not None:
+            results_file.close()
+
+    return ArenaSummary(tally, verdict)
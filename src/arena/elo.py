@@ -0,0 +1,115 @@
+# stdlib imports
+import math
+from typing import NamedTuple, Tuple
+
+
+###############################################################################
+#   Elo helpers
+#
+def elo_to_score(elo: float) -> float:
+    """Expected score of a player rated `elo` points above its opponent."""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    """Elo difference matching an expected score, clamped away from 0 and 1 so that it stays finite."""
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+###############################################################################
+#   Match Tally
+#
+class MatchTally:
+    """
+    Wins, draws and losses of a player A against a player B, with the Elo difference they imply.
+    """
+    def __init__(self) -> None:
+        self.wins: int = 0
+        self.draws: int = 0
+        self.losses: int = 0
+
+    def add(self, score: float) -> None:
+        """Adds the result of one game, scored 1 for a win of A, 0.5 for a draw and 0 for a loss."""
+        if score == 1.0:
+            self.wins += 1
+        elif score == 0.5:
+            self.draws += 1
+        elif score == 0.0:
+            self.losses += 1
+        else:
+            raise ValueError(f"Invalid game score: {score}")
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """Average score of A per game."""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games > 0 else 0.5
+
+    @property
+    def score_variance(self) -> float:
+        """Variance of the score of one game."""
+        if self.games == 0:
+            return 0.0
+        mean = self.score
+        return (self.wins * (1.0 - mean) ** 2 + self.draws * (0.5 - mean) ** 2 + self.losses * mean**2) / self.games
+
+    @property
+    def elo(self) -> float:
+        """Estimated Elo difference of A over B."""
+        return score_to_elo(self.score)
+
+    def elo_interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """Confidence interval of the Elo difference, by default at 95%."""
+        if self.games == 0:
+            return (-math.inf, math.inf)
+        margin = z * math.sqrt(self.score_variance / self.games)
+        return (score_to_elo(self.score - margin), score_to_elo(self.score + margin))
+
+    def __str__(self) -> str:
+        elo_low, elo_high = self.elo_interval()
+        return f"W/D/L {self.wins}/{self.draws}/{self.losses} ({self.games} games), score {self.score:.3f}, Elo {self.elo:+.1f} [{elo_low:+.1f}, {elo_high:+.1f}]"
+
+
+###############################################################################
+#   Sequential Probability Ratio Test
+#
+class SPRT(NamedTuple):
+    """
+    Sequential probability ratio test of H0: "A is elo0 stronger than B" against H1: "A is elo1 stronger than B".
+
+    The log-likelihood ratio uses the usual normal approximation of the game scores, so the test can be
+    checked after every game and stops as soon as one hypothesis is accepted.
+    """
+    elo0: float = 0.0
+    elo1: float = 10.0
+    alpha: float = 0.05  # Probability of accepting H1 when H0 is true
+    beta: float = 0.05  # Probability of accepting H0 when H1 is true
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        """Lower and upper bounds of the log-likelihood ratio."""
+        return (math.log(self.beta / (1.0 - self.alpha)), math.log((1.0 - self.beta) / self.alpha))
+
+    def llr(self, tally: MatchTally) -> float:
+        """Log-likelihood ratio of H1 against H0 for the games of the tally."""
+        if tally.games == 0:
+            return 0.0
+        # A one-sided tally, e.g. only wins, has no variance: floor it as if one win and one loss were shared over the games
+        variance = max(tally.score_variance, 0.25 / tally.games)
+        score0 = elo_to_score(self.elo0)
+        score1 = elo_to_score(self.elo1)
+        return tally.games * (score1 - score0) * (2.0 * tally.score - score0 - score1) / (2.0 * variance)
+
+    def verdict(self, tally: MatchTally) -> str | None:
+        """Returns "H1" or "H0" once a hypothesis is accepted, None while the test must go on."""
+        llr = self.llr(tally)
+        lower_bound, upper_bound = self.bounds
+        if llr >= upper_bound:
+            return "H1"
+        if llr <= lower_bound:
+            return "H0"
+        return None
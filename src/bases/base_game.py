@@ -1,24 +1,52 @@
 # stdlib imports
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple, Type, TypeVar
 from abc import ABC, abstractmethod
 
 # local imports
 from .move import Move
 from .types import PlayerID, GameResult
 
+GameT = TypeVar("GameT", bound="BaseGame")
+
 class BaseGame(ABC):
-    board: List[int]
-    """The game board as a list of integers"""
     current_player: PlayerID
     """the player to move next"""
+    last_move: int | None
+    """index of the last move played, None if no move has been played yet"""
+    empty_count: int
+    """number of empty squares left on the board"""
+    zobrist_hash: int
+    """64-bit Zobrist hash of the position (board and player to move), updated incrementally"""
+    variant_name: str
+    """name of the game and board size, e.g. "connect4_6x7": positions of different variants must not share a key"""
+    initial_empty_count: int
+    """number of empty squares in the initial position"""
+
+    # Legal moves and winner of the position, computed lazily at most once per position. Copies share them,
+    # and every move in place clears them
+    _legal_moves_cache: List[Move] | None = None
+    _winner_cache: GameResult | None = None
+    _winner_cached: bool = False
+
+    @property
+    def ply(self) -> int:
+        """Number of moves played since the initial position. Othello passes are not counted."""
+        return self.initial_empty_count - self.empty_count
 
     def is_game_over(self) -> bool:
         """Returns True if the game is over (win or draw), else False."""
         return self.get_winner() is not None
 
-    @abstractmethod
     def get_legal_moves(self) -> List[Move]:
-        """Returns a list of legal moves."""
+        """Returns a list of legal moves. The list is cached and shared, so it must not be modified."""
+        legal_moves = self._legal_moves_cache
+        if legal_moves is None:
+            legal_moves = self._legal_moves_cache = self._generate_legal_moves()
+        return legal_moves
+
+    @abstractmethod
+    def _generate_legal_moves(self) -> List[Move]:
+        """Generates the list of legal moves, without caching."""
         pass
 
     @abstractmethod
@@ -31,7 +59,113 @@ class BaseGame(ABC):
         """Returns a new GameBase object after making the move."""
         pass
 
+    ###########################################################################
+    #   Compact state keys
+    #
     @abstractmethod
+    def state_key(self) -> int:
+        """
+        Returns a compact immutable key of the position: 2 bits per square (an 'X' bit and an 'O' bit) and 1 bit
+        for the player to move. Two positions of the same game and board size are equal if and only if their keys are.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def from_state_key(cls, state_key: int, *board_size: int) -> "BaseGame":
+        """
+        Rebuilds a position from its state key. `board_size` are the board size arguments of the constructor.
+        The rebuilt position has no move history: its last_move is None and it cannot undo moves.
+        """
+        pass
+
+    @abstractmethod
+    def board_size(self) -> Tuple[int, ...]:
+        """Returns the board size arguments of the constructor, e.g. (rows, cols), to rebuild the position with from_state_key."""
+        pass
+
+    @staticmethod
+    def _pack_state_key(bitboard_x: int, bitboard_o: int, square_count: int, current_player: PlayerID) -> int:
+        """Packs the discs of each player, on `square_count` bits each, and the player to move into a state key."""
+        return (((bitboard_o << square_count) | bitboard_x) << 1) | (current_player == -1)
+
+    @staticmethod
+    def _unpack_state_key(state_key: int, square_count: int) -> Tuple[int, int, PlayerID]:
+        """Returns the (bitboard_x, bitboard_o, current_player) packed in a state key."""
+        square_mask = (1 << square_count) - 1
+        current_player = PlayerID(-1 if state_key & 1 else 1)
+        state_key >>= 1
+        return state_key & square_mask, state_key >> square_count, current_player
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BaseGame) or type(other) is not type(self):
+            return NotImplemented
+        return self.board_size() == other.board_size() and self.state_key() == other.state_key()
+
+    def __hash__(self) -> int:
+        # The hash follows the position, so a game must not be changed in place while it is in a set or a dict
+        return self.zobrist_hash
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickle as a state key, e.g. to send positions to worker processes
+        return (_rebuild_game, (type(self), self.state_key(), self.board_size()))
+
+    def apply_move(self, move: Move) -> None:
+        """
+        Plays the move in place, and pushes what is needed to revert it on the undo stack.
+        This is the allocation-free alternative to make_move. Optional, games without it raise NotImplementedError.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support in-place moves.")
+
+    def undo_move(self) -> None:
+        """Reverts in place the last move played with apply_move."""
+        raise NotImplementedError(f"{type(self).__name__} does not support in-place moves.")
+
     def get_winner(self) -> GameResult | None:
         """Returns 1 if player 1 wins, -1 if player -1 wins, 0 if draw, None if ongoing."""
+        if not self._winner_cached:
+            self._winner_cache = self._compute_winner()
+            self._winner_cached = True
+        return self._winner_cache
+
+    @abstractmethod
+    def _compute_winner(self) -> GameResult | None:
+        """Computes the result of the game, without caching."""
         pass
+
+    def tactical_moves(self) -> List[Move]:
+        """
+        Rollout hook: returns the moves winning at once for the player to move, or if there are none, the moves
+        blocking an immediate win of the opponent. Optional, games without it return no move.
+        """
+        return []
+
+    def move_weights(self) -> Sequence[float] | None:
+        """
+        Rollout hook: returns the prior weight of playing each move index, e.g. to prefer Othello corners.
+        Optional, games without it return None, all moves being equally likely.
+        """
+        return None
+
+    def _clear_cache(self) -> None:
+        """Forgets the cached legal moves and winner. To be called by every method changing the position in place."""
+        self._legal_moves_cache = None
+        self._winner_cached = False
+
+    def _blank_copy(self: GameT) -> GameT:
+        """
+        Returns an uninitialised instance of the game's class, for copy() to fill in every field. Going through __init__
+        would set up, and for some games hash, the initial position only for the copy to overwrite it.
+        """
+        return type(self).__new__(type(self))
+
+    def _copy_cache(self, new_game: "BaseGame") -> None:
+        """Shares the cached legal moves and winner with a copy of the position."""
+        new_game._legal_moves_cache = self._legal_moves_cache
+        new_game._winner_cache = self._winner_cache
+        new_game._winner_cached = self._winner_cached
+
+
+def _rebuild_game(game_class: Type[BaseGame], state_key: int, board_size: Tuple[int, ...]) -> BaseGame:
+    """Unpickles a position from its state key."""
+    return game_class.from_state_key(state_key, *board_size)
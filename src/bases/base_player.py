@@ -35,5 +35,8 @@ class BasePlayer(ABC):
         """Create and return a copy of this player instance."""
         raise NotImplementedError
 
+    def close(self) -> None:
+        """Frees the resources held by the player, e.g. worker processes. Does nothing by default."""
+
     def __str__(self) -> str:
         return f"{self.__class__.__name__}({self.marker})"
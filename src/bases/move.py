@@ -1,27 +1,48 @@
 # stdlib imports
+import functools
 from functools import total_ordering
+from typing import List, Tuple
 
 @total_ordering
 class Move():
     """
     class to represent a move in a game.
     Encodes the move as an integer index in a 1D array representing the board.
+
+    Moves are immutable and hashable. The games hand out interned instances, from `Move.of` or `move_table`,
+    so that generating moves allocates no Move object.
     """
+    __slots__ = ("_index",)
 
     def __init__(self, move_idx: int):
         self._index: int = move_idx
 
+    @staticmethod
+    def of(move_idx: int) -> "Move":
+        """Returns the interned Move of the index, allocated once per process. Raises ValueError for a negative index."""
+        if move_idx < 0:
+            raise ValueError(f"Invalid move index: {move_idx}")
+        if move_idx >= len(_interned_moves):
+            _interned_moves.extend(Move(index) for index in range(len(_interned_moves), move_idx + 1))
+        return _interned_moves[move_idx]
+
     def __int__(self) -> int:
         """Return the integer index of the move."""
         return self._index
-    
+
     def __str__(self) -> str:
         return f"{self._index}"
-    
+
+    def __repr__(self) -> str:
+        return f"Move({self._index})"
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, Move):
             return False
-        return int(self) == int(other)
+        return self._index == other._index
+
+    def __hash__(self) -> int:
+        return hash(self._index)
 
     def __lt__(self, other) -> bool:
         """
@@ -32,4 +53,18 @@ class Move():
         """
         if not isinstance(other, Move):
             return NotImplemented
-        return int(self) < int(other)
\ No newline at end of file
+        return self._index < other._index
+
+    def __reduce__(self):
+        # Unpickle to the interned instance, e.g. for moves sent back by worker processes
+        return (Move.of, (self._index,))
+
+
+# Interned moves, indexed by move index
+_interned_moves: List[Move] = []
+
+
+@functools.lru_cache(maxsize=None)
+def move_table(move_count: int) -> Tuple[Move, ...]:
+    """Returns the interned moves of indices 0 to move_count - 1, as a tuple shared by all the games of that size."""
+    return tuple(Move.of(move_idx) for move_idx in range(move_count))
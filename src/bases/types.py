@@ -1,4 +1,4 @@
-from typing import NewType, Literal
+from typing import NewType, Literal, NamedTuple
 
 ###############################################################################
 #   PlayerID and PlayerMarker
@@ -22,3 +22,20 @@ def game_result_to_str(result: GameResult) -> str:
     else:
         raise ValueError("Invalid GameResult value")
 
+###############################################################################
+#   PlayoutOutcomes
+#
+class PlayoutOutcomes(NamedTuple):
+    """Counts of the results of a batch of playouts."""
+    x_wins: int
+    o_wins: int
+    draws: int
+
+    @property
+    def total(self) -> int:
+        """Total number of playouts."""
+        return self.x_wins + self.o_wins + self.draws
+
+    def wins_for(self, player_id: PlayerID) -> int:
+        """Number of playouts won by the given player."""
+        return self.x_wins if player_id == 1 else self.o_wins
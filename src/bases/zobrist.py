@@ -0,0 +1,33 @@
+# stdlib imports
+import functools
+import random
+from typing import List, NamedTuple
+
+
+###############################################################################
+#   Zobrist keys
+#
+class ZobristKeys(NamedTuple):
+    """
+    Random keys used to hash a position: the hash is the XOR of the keys of every disc on the board,
+    and of `side_key` when 'O' (Player -1) is to move. It can be updated incrementally by XORing the keys
+    of the squares which change.
+    """
+    x_keys: List[int]
+    """key of a disc of 'X' (Player 1) on each square"""
+    o_keys: List[int]
+    """key of a disc of 'O' (Player -1) on each square"""
+    side_key: int
+    """key of 'O' (Player -1) being the player to move"""
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_keys(game_name: str, square_count: int) -> ZobristKeys:
+    """
+    Returns the 64-bit Zobrist keys of a game with the given number of squares.
+    They are seeded from the game name and the square count, so the hashes are stable across runs and processes.
+    """
+    rnd_generator = random.Random(f"{game_name}:{square_count}")
+    x_keys = [rnd_generator.getrandbits(64) for _ in range(square_count)]
+    o_keys = [rnd_generator.getrandbits(64) for _ in range(square_count)]
+    return ZobristKeys(x_keys, o_keys, rnd_generator.getrandbits(64))
@@ -0,0 +1,104 @@
+# stdlib imports
+import sqlite3
+import threading
+from typing import Dict, NamedTuple, Tuple
+
+# local imports
+from src.bases.base_game import BaseGame
+
+
+###############################################################################
+#   Book Entry
+#
+class BookEntry(NamedTuple):
+    """Search results stored for one position."""
+    simulations: int
+    """total number of simulations merged into the entry"""
+    move_stats: Dict[int, Tuple[int, float]]
+    """maps each searched move (int) to its (visits, wins), wins being counted for the player to move"""
+
+
+###############################################################################
+#   Opening Book
+#
+class OpeningBook:
+    """
+    Persistent store of root search results in a SQLite file, keyed by game variant and Zobrist hash.
+
+    Results merged for a position add up, so repeated searches of the same opening keep deepening its entry.
+    The file can be shared by several processes: SQLite serialises the writes.
+    """
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS positions (
+            variant TEXT NOT NULL,
+            position_hash INTEGER NOT NULL,
+            simulations INTEGER NOT NULL,
+            PRIMARY KEY (variant, position_hash)
+        );
+        CREATE TABLE IF NOT EXISTS moves (
+            variant TEXT NOT NULL,
+            position_hash INTEGER NOT NULL,
+            move INTEGER NOT NULL,
+            visits INTEGER NOT NULL,
+            wins REAL NOT NULL,
+            PRIMARY KEY (variant, position_hash, move)
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        # The connection is used from whichever thread calls the book, one at a time
+        self._connection = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(self._SCHEMA)
+
+    @staticmethod
+    def _position_key(game: BaseGame) -> Tuple[str, int]:
+        """Returns the (variant, hash) key of the position. The unsigned 64-bit hash is mapped to the signed range of SQLite integers."""
+        position_hash = game.zobrist_hash
+        if position_hash >= 1 << 63:
+            position_hash -= 1 << 64
+        return game.variant_name, position_hash
+
+    def lookup(self, game: BaseGame) -> BookEntry | None:
+        """Returns the entry of the position, or None if it has never been searched."""
+        variant, position_hash = self._position_key(game)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT simulations FROM positions WHERE variant = ? AND position_hash = ?", (variant, position_hash)
+            ).fetchone()
+            if row is None:
+                return None
+            move_rows = self._connection.execute(
+                "SELECT move, visits, wins FROM moves WHERE variant = ? AND position_hash = ?", (variant, position_hash)
+            ).fetchall()
+        return BookEntry(row[0], {move: (visits, wins) for move, visits, wins in move_rows})
+
+    def merge(self, game: BaseGame, simulations: int, move_stats: Dict[int, Tuple[int, float]]) -> None:
+        """Adds the results of a search of the position to its entry."""
+        variant, position_hash = self._position_key(game)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT INTO positions (variant, position_hash, simulations) VALUES (?, ?, ?)
+                ON CONFLICT (variant, position_hash) DO UPDATE SET simulations = simulations + excluded.simulations
+                """,
+                (variant, position_hash, simulations),
+            )
+            self._connection.executemany(
+                """
+                INSERT INTO moves (variant, position_hash, move, visits, wins) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (variant, position_hash, move) DO UPDATE SET visits = visits + excluded.visits, wins = wins + excluded.wins
+                """,
+                [(variant, position_hash, move, visits, wins) for move, (visits, wins) in move_stats.items()],
+            )
+
+    def __len__(self) -> int:
+        """Number of positions in the book."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -1,13 +1,29 @@
 # stdlib imports
-from typing import List, Optional
+import functools
+from typing import List, Optional, Tuple
 
 # pip imports
 import colorama
 
 # local imports
 from src.bases.base_game import BaseGame
-from src.bases.move import Move
+from src.bases.move import Move, move_table
 from src.bases.types import GameResult, PlayerID, player_id_to_marker
+from src.bases.zobrist import zobrist_keys
+
+###############################################################################
+#   Precomputed bitboard masks
+#
+@functools.lru_cache(maxsize=None)
+def _connect4_masks(rows: int, cols: int) -> Tuple[int, int]:
+    """
+    Returns the (bottom_mask, board_mask) bitboards of a board of the given size, computed once per size:
+    the bottom square of each column, and every square of the board, sentinel bits excluded.
+    """
+    height = rows + 1
+    bottom_mask = sum(1 << (col * height) for col in range(cols))
+    board_mask = bottom_mask * ((1 << rows) - 1)
+    return bottom_mask, board_mask
 
 ###############################################################################
 #   Represents the state and rules of a Connect 4 game.
@@ -15,21 +31,58 @@ from src.bases.types import GameResult, PlayerID, player_id_to_marker
 class GameConnect4(BaseGame):
     """
     Represents the state and rules of a Connect 4 game.
+
+    The position is stored as two bitboards (one per player) plus the height of each column.
+    Each column uses `rows + 1` bits, from bottom to top, the extra bit being an always-empty
+    sentinel so that shifts never carry a line over to the next column:
+
+        bit index of (row_from_bottom, col) = col * (rows + 1) + row_from_bottom
     """
     def __init__(self, rows: int = 6, cols: int = 7) -> None:
         self.rows: int = rows
         self.cols: int = cols
-        # The board is a flattened list for easy representation,
-        # where 0=Empty, 1='X' (Player 1), -1='O' (Player -1)
-        self.board: List[int] = [0] * (rows * cols)
+        # Bitboards of the discs of 'X' (Player 1) and 'O' (Player -1)
+        self.bitboard_x: int = 0
+        self.bitboard_o: int = 0
+        # Number of discs in each column
+        self.heights: List[int] = [0] * cols
         self.current_player = PlayerID(1)
+        self.last_move: int | None = None
+        self.empty_count: int = rows * cols
+        self.initial_empty_count: int = self.empty_count
+        self.variant_name: str = f"connect4_{rows}x{cols}"
+        # Interned moves, indexed by column
+        self._moves: Tuple[Move, ...] = move_table(cols)
+        # Zobrist keys are indexed by bit index, sentinel bits included
+        self._zobrist_keys = zobrist_keys(f"connect4_{rows}x{cols}", cols * (rows + 1))
+        self.zobrist_hash: int = 0
+        # (column played, previous last move) for each move played with apply_move, most recent last
+        self._undo_stack: List[Tuple[int, int | None]] = []
+
+    @property
+    def board(self) -> List[int]:
+        """
+        The board as a flattened list, top row first, where 0=Empty, 1='X' (Player 1), -1='O' (Player -1).
+        Rebuilt from the bitboards, it is meant for display and debugging only.
+        """
+        board: List[int] = [0] * (self.rows * self.cols)
+        for row_index in range(self.rows):
+            row_from_bottom = self.rows - 1 - row_index
+            for col_index in range(self.cols):
+                bit = 1 << (col_index * (self.rows + 1) + row_from_bottom)
+                if self.bitboard_x & bit:
+                    board[row_index * self.cols + col_index] = 1
+                elif self.bitboard_o & bit:
+                    board[row_index * self.cols + col_index] = -1
+        return board
 
     def __repr__(self) -> str:
         """Prints a human-readable board representation, showing move indices on empty cells."""
+        board = self.board
         output: str = ""
         output += "   ".join([str(j) for j in range(self.cols)]) + "\n"  # Column indices
         for row_index in range(self.rows):
-            row = self.board[row_index * self.cols : (row_index + 1) * self.cols]
+            row = board[row_index * self.cols : (row_index + 1) * self.cols]
             row_symbols = []
             for col_index, cell in enumerate(row):
                 if cell == 1:
@@ -45,20 +98,30 @@ class GameConnect4(BaseGame):
                 output += "--" + "+---" * (self.cols - 1) + "\n"
         return output
 
-    def get_legal_moves(self) -> List[Move]:
+    def _generate_legal_moves(self) -> List[Move]:
         """Returns a list of column indices (0 to cols-1) where moves can be made."""
-        legal_moves: list[Move] = []
-        for col in range(self.cols):
-            if self.board[col] == 0:  # If the top cell of the column is empty
-                legal_moves.append(Move(col))
-        return legal_moves
-    
+        rows = self.rows
+        moves = self._moves
+        return [moves[col] for col, height in enumerate(self.heights) if height < rows]
 
     def copy(self) -> "GameConnect4":
         """Returns a deep copy of the current game state."""
-        new_game = GameConnect4(self.rows, self.cols)
-        new_game.board = list(self.board)  # Deep copy the board
+        new_game = self._blank_copy()
+        new_game.rows = self.rows
+        new_game.cols = self.cols
+        new_game.bitboard_x = self.bitboard_x
+        new_game.bitboard_o = self.bitboard_o
+        new_game.heights = list(self.heights)
         new_game.current_player = self.current_player
+        new_game.last_move = self.last_move
+        new_game.empty_count = self.empty_count
+        new_game.initial_empty_count = self.initial_empty_count
+        new_game.variant_name = self.variant_name
+        new_game._moves = self._moves
+        new_game._zobrist_keys = self._zobrist_keys
+        new_game.zobrist_hash = self.zobrist_hash
+        new_game._undo_stack = []
+        self._copy_cache(new_game)
         return new_game
 
     def make_move(self, move: Move) -> "GameConnect4":
@@ -66,51 +129,152 @@ class GameConnect4(BaseGame):
         Creates and returns a new Connect4 object after making the move.
         Assumes the move is valid (i.e., the column is not full).
         """
+        # Create a new game state
+        new_game = self.copy()
+        new_game.apply_move(move)
+        return new_game
+
+    def apply_move(self, move: Move) -> None:
+        """Plays the move in place. Assumes the move is valid (i.e., the column is not full)."""
+        self._clear_cache()
         move_idx = int(move)
-        if move_idx < 0 or move_idx >= self.cols or self.board[move_idx] != 0:
+        if move_idx < 0 or move_idx >= self.cols or self.heights[move_idx] >= self.rows:
             raise ValueError("Invalid move attempted on a full or out-of-bounds column.")
 
-        # Create a new game state
-        new_game = self.copy()
-        
         # Play the move in the lowest available row in the specified column
-        for row in range(self.rows - 1, -1, -1):
-            square_idx = row * self.cols + move_idx
-            if new_game.board[square_idx] == 0:
-                new_game.board[square_idx] = self.current_player
-                break
+        bit_index = move_idx * (self.rows + 1) + self.heights[move_idx]
+        if self.current_player == 1:
+            self.bitboard_x |= 1 << bit_index
+            self.zobrist_hash ^= self._zobrist_keys.x_keys[bit_index] ^ self._zobrist_keys.side_key
+        else:
+            self.bitboard_o |= 1 << bit_index
+            self.zobrist_hash ^= self._zobrist_keys.o_keys[bit_index] ^ self._zobrist_keys.side_key
+        self.heights[move_idx] += 1
+        self._undo_stack.append((move_idx, self.last_move))
+        self.last_move = move_idx
+        self.empty_count -= 1
 
         # Switch player
-        new_game.current_player = PlayerID(-self.current_player)
-        return new_game
-    
-    def get_winner(self) -> GameResult | None:
+        self.current_player = PlayerID(-self.current_player)
+
+    def undo_move(self) -> None:
+        """Reverts in place the last move played with apply_move."""
+        self._clear_cache()
+        move_idx, self.last_move = self._undo_stack.pop()
+        self.heights[move_idx] -= 1
+        self.empty_count += 1
+        bit_index = move_idx * (self.rows + 1) + self.heights[move_idx]
+        # Switch back to the player who made the move
+        self.current_player = PlayerID(-self.current_player)
+        if self.current_player == 1:
+            self.bitboard_x &= ~(1 << bit_index)
+            self.zobrist_hash ^= self._zobrist_keys.x_keys[bit_index] ^ self._zobrist_keys.side_key
+        else:
+            self.bitboard_o &= ~(1 << bit_index)
+            self.zobrist_hash ^= self._zobrist_keys.o_keys[bit_index] ^ self._zobrist_keys.side_key
+
+    def _compute_winner(self) -> GameResult | None:
         """
         Checks for a win. Returns 1 if 'X' wins, -1 if 'O' wins, 0 if no winner,
         and None if the game is still ongoing.
         """
-        # Check horizontal, vertical, and diagonal (both directions) for a connect 4
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]  # right, down, down-right, down-left
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.board[row * self.cols + col] == 0:
-                    continue
-                player = self.board[row * self.cols + col]
-                for dr, dc in directions:
-                    count = 0
-                    r, c = row, col
-                    while 0 <= r < self.rows and 0 <= c < self.cols and self.board[r * self.cols + c] == player:
-                        count += 1
-                        if count == 4:
-                            return GameResult(player)
-                        r += dr
-                        c += dc
-        
-        if all(cell != 0 for cell in self.board):
+        if self.last_move is not None:
+            # Only the player who just moved can have completed a line. On a bitboard, checking the whole
+            # board costs the same few shifts as checking the lines through the last move.
+            last_player = -self.current_player
+            bitboard = self.bitboard_x if last_player == 1 else self.bitboard_o
+            if self._has_four_in_a_row(bitboard):
+                return GameResult(last_player)
+        else:
+            # No known last move, e.g. a position rebuilt from its state key: check both players
+            if self._has_four_in_a_row(self.bitboard_x):
+                return GameResult(1)
+            if self._has_four_in_a_row(self.bitboard_o):
+                return GameResult(-1)
+
+        if self.empty_count == 0:
             return GameResult(0)  # Draw
-        
+
         return None  # Game is still ongoing
 
+    def state_key(self) -> int:
+        """Returns the compact key of the position: the two bitboards, sentinel bits included, and the player to move."""
+        return self._pack_state_key(self.bitboard_x, self.bitboard_o, self.cols * (self.rows + 1), self.current_player)
+
+    @classmethod
+    def from_state_key(cls, state_key: int, *board_size: int) -> "GameConnect4":
+        """Rebuilds a position from its state key, board_size being (rows, cols)."""
+        game = cls(*board_size)
+        height = game.rows + 1
+        game.bitboard_x, game.bitboard_o, game.current_player = cls._unpack_state_key(state_key, game.cols * height)
+        occupied = game.bitboard_x | game.bitboard_o
+        column_mask = (1 << height) - 1
+        game.heights = [(occupied >> (col * height) & column_mask).bit_count() for col in range(game.cols)]
+        game.empty_count = game.rows * game.cols - occupied.bit_count()
+        game.zobrist_hash = game._compute_zobrist_hash()
+        return game
+
+    def board_size(self) -> Tuple[int, ...]:
+        return (self.rows, self.cols)
+
+    def _compute_zobrist_hash(self) -> int:
+        """Computes the Zobrist hash of the position from scratch."""
+        zobrist_hash = self._zobrist_keys.side_key if self.current_player == -1 else 0
+        for bit_index in range(self.cols * (self.rows + 1)):
+            if self.bitboard_x >> bit_index & 1:
+                zobrist_hash ^= self._zobrist_keys.x_keys[bit_index]
+            elif self.bitboard_o >> bit_index & 1:
+                zobrist_hash ^= self._zobrist_keys.o_keys[bit_index]
+        return zobrist_hash
+
+    def tactical_moves(self) -> List[Move]:
+        """Returns the columns winning at once for the player to move, or else the columns blocking an immediate win of the opponent."""
+        bottom_mask, board_mask = _connect4_masks(self.rows, self.cols)
+        occupied = self.bitboard_x | self.bitboard_o
+        # Adding the bottom mask carries each column's lowest empty square into place, full columns carry into the sentinel
+        playable = (occupied + bottom_mask) & board_mask
+        own, opponent = (self.bitboard_x, self.bitboard_o) if self.current_player == 1 else (self.bitboard_o, self.bitboard_x)
+        empty = board_mask & ~occupied
+        target_squares = self._winning_squares(own) & empty & playable
+        if not target_squares:
+            target_squares = self._winning_squares(opponent) & empty & playable
+        height = self.rows + 1
+        moves = self._moves
+        tactical_moves: List[Move] = []
+        while target_squares:
+            lowest_bit = target_squares & -target_squares
+            tactical_moves.append(moves[(lowest_bit.bit_length() - 1) // height])
+            target_squares ^= lowest_bit
+        return tactical_moves
+
+    def _winning_squares(self, bitboard: int) -> int:
+        """
+        Returns the squares completing 4 aligned discs of the bitboard, occupied or not.
+        Vertically only the square on top of 3 discs can, in the other directions the square can also be inside the line.
+        """
+        height = self.rows + 1
+        winning_squares = (bitboard << 1) & (bitboard << 2) & (bitboard << 3)
+        for shift in (height, height + 1, height - 1):
+            shifted_left = bitboard << shift
+            shifted_right = bitboard >> shift
+            pairs = shifted_left & (bitboard << 2 * shift)
+            winning_squares |= pairs & ((bitboard << 3 * shift) | shifted_right)
+            pairs = shifted_right & (bitboard >> 2 * shift)
+            winning_squares |= pairs & (shifted_left | (bitboard >> 3 * shift))
+        return winning_squares
+
+    def _has_four_in_a_row(self, bitboard: int) -> bool:
+        """
+        Returns True if the bitboard contains 4 aligned discs.
+        Each shift moves a disc to its neighbour in one direction: vertical, horizontal, and both diagonals.
+        """
+        height = self.rows + 1
+        for shift in (1, height, height + 1, height - 1):
+            pairs = bitboard & (bitboard >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
 ###############################################################################
 #   --- Example Usage (Unchanged) ---
 #
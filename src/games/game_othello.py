@@ -1,42 +1,144 @@
 # stdlib imports
-from typing import List, Optional
+import functools
+from typing import List, Optional, Tuple
 
 # pip imports
 import colorama
 
 # local imports
 from src.bases.types import GameResult, PlayerID, player_id_to_marker
-from src.bases.move import Move
+from src.bases.move import Move, move_table
 from src.bases.base_game import BaseGame
+from src.bases.zobrist import zobrist_keys
 
 
+###############################################################################
+#   Precomputed bitboard tables
+#
+@functools.lru_cache(maxsize=None)
+def _othello_tables(size: int) -> Tuple[List[Tuple[int, int]], List[List[int]]]:
+    """
+    Returns the bitboard tables for a board of the given size, computed once per size.
+    - directions: for each of the 8 directions, a (shift, wrap_mask) pair. A bitboard is moved one square
+      in the direction by shifting it (left if shift > 0, right otherwise) then masking it with wrap_mask,
+      which removes the squares that wrapped around the board edge.
+    - rays: rays[square][direction] is the mask of all the squares from `square` (excluded) to the board
+      edge in that direction. They are the flip masks of a move, trimmed at the first non-opponent disc.
+    """
+    full_mask = (1 << (size * size)) - 1
+    first_col_mask = sum(1 << (row * size) for row in range(size))
+    last_col_mask = first_col_mask << (size - 1)
+    directions: List[Tuple[int, int]] = []
+    rays: List[List[int]] = [[] for _ in range(size * size)]
+    for dr, dc in _DIRECTIONS:
+        if dc == 1:
+            wrap_mask = full_mask & ~first_col_mask
+        elif dc == -1:
+            wrap_mask = full_mask & ~last_col_mask
+        else:
+            wrap_mask = full_mask
+        directions.append((dr * size + dc, wrap_mask))
+        for square in range(size * size):
+            row, col = divmod(square, size)
+            ray = 0
+            r, c = row + dr, col + dc
+            while 0 <= r < size and 0 <= c < size:
+                ray |= 1 << (r * size + c)
+                r += dr
+                c += dc
+            rays[square].append(ray)
+    return directions, rays
+
+@functools.lru_cache(maxsize=None)
+def _othello_square_weights(size: int) -> List[float]:
+    """
+    Returns the rollout weight of each square of a board of the given size, computed once per size.
+    Corners, which can never be flipped, are strongly preferred, while the squares giving a corner away
+    (diagonally next to it, or next to it on an edge) are avoided.
+    """
+    corners = {(0, 0), (0, size - 1), (size - 1, 0), (size - 1, size - 1)}
+    weights: List[float] = []
+    for square in range(size * size):
+        row, col = divmod(square, size)
+        nearest_corner_distances = min((abs(row - corner_row), abs(col - corner_col)) for corner_row, corner_col in corners)
+        on_edge = row in (0, size - 1) or col in (0, size - 1)
+        if nearest_corner_distances == (0, 0):
+            weights.append(30.0)  # corner
+        elif nearest_corner_distances == (1, 1):
+            weights.append(1.0)  # X-square, diagonally next to a corner
+        elif on_edge and max(nearest_corner_distances) == 1:
+            weights.append(2.0)  # C-square, next to a corner on an edge
+        elif on_edge:
+            weights.append(8.0)
+        else:
+            weights.append(4.0)
+    return weights
+
+_DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1),
+               (0, -1),          (0, 1),
+               (1, -1), (1, 0), (1, 1)]
+
 ###############################################################################
 #   Represents the state and rules of an Othello game.
 #
 class GameOthello(BaseGame):
     """
     Represents the state and rules of an Othello game.
+
+    The position is stored as two bitboards (one per player), where bit `row * size + col` is the square
+    of the same move index.
+
+    A player without any legal move passes: the turn goes back to the other player, so `current_player`
+    always has a legal move unless the game is over. The game ends when neither player can move.
     """
     def __init__(self, size: int = 8) -> None:
         self.size: int = size
-        # The board is a flattened list for easy representation,
-        # where 0=Empty, 1='X' (Player 1), -1='O' (Player -1)
-        self.board: List[int] = [0] * (size * size)
+        # Bitboards of the discs of 'X' (Player 1) and 'O' (Player -1)
+        self.bitboard_x: int = 0
+        self.bitboard_o: int = 0
         # Initialize the starting position
         mid = size // 2
-        self.board[(mid - 1) * size + (mid - 1)] = -1
-        self.board[(mid - 1) * size + mid] = 1
-        self.board[mid * size + (mid - 1)] = 1
-        self.board[mid * size + mid] = -1
+        self.bitboard_o |= 1 << ((mid - 1) * size + (mid - 1))
+        self.bitboard_x |= 1 << ((mid - 1) * size + mid)
+        self.bitboard_x |= 1 << (mid * size + (mid - 1))
+        self.bitboard_o |= 1 << (mid * size + mid)
         # 1: 'X', -1: 'O'
         self.current_player = PlayerID(1)
+        self.last_move: int | None = None
+        self.empty_count: int = size * size - 4
+        self.initial_empty_count: int = self.empty_count
+        self.variant_name: str = f"othello_{size}x{size}"
+        # Interned moves, indexed by square
+        self._moves: Tuple[Move, ...] = move_table(size * size)
+        self._zobrist_keys = zobrist_keys("othello", size * size)
+        self.zobrist_hash: int = self._compute_zobrist_hash()
+        # Bitboard of the legal moves of the player to move, None until computed. apply_move gets it for free from its pass check
+        self._moves_mask: int | None = None
+        # (move bit, flipped discs, player who moved, previous last move, previous hash) for each move played with apply_move, most recent last
+        self._undo_stack: List[Tuple[int, int, PlayerID, int | None, int]] = []
+
+    @property
+    def board(self) -> List[int]:
+        """
+        The board as a flattened list, where 0=Empty, 1='X' (Player 1), -1='O' (Player -1).
+        Rebuilt from the bitboards, it is meant for display and debugging only.
+        """
+        board: List[int] = [0] * (self.size * self.size)
+        for square_index in range(self.size * self.size):
+            bit = 1 << square_index
+            if self.bitboard_x & bit:
+                board[square_index] = 1
+            elif self.bitboard_o & bit:
+                board[square_index] = -1
+        return board
 
     def __repr__(self) -> str:
         """Prints a human-readable board representation, showing move indices on empty cells which are legal moves."""
         output: str = ""
+        board = self.board
         legal_move_indices = [int(move) for move in self.get_legal_moves()]
         for row_index in range(self.size):
-            row = self.board[row_index * self.size : (row_index + 1) * self.size]
+            row = board[row_index * self.size : (row_index + 1) * self.size]
             row_strs = []
             for col_index, cell in enumerate(row):
                 if cell == 1:
@@ -56,39 +158,34 @@ class GameOthello(BaseGame):
                 output += "---" + "+----" * (self.size - 1) + "\n"
         return output
 
-    def get_legal_moves(self) -> List[Move]:
+    def _generate_legal_moves(self) -> List[Move]:
         """Returns a list of indices where moves can be made."""
-        directions = [(-1, -1), (-1, 0), (-1, 1),
-                      (0, -1),          (0, 1),
-                      (1, -1), (1, 0), (1, 1)]
-        legal_move_indices = set()
-        
-        for idx, cell in enumerate(self.board):
-            if cell != 0:
-                continue
-            row, col = divmod(idx, self.size)
-            for dr, dc in directions:
-                r, c = row + dr, col + dc
-                found_opponent = False
-                while 0 <= r < self.size and 0 <= c < self.size:
-                    neighbor_idx = r * self.size + c
-                    if self.board[neighbor_idx] == -self.current_player:
-                        found_opponent = True
-                    elif self.board[neighbor_idx] == self.current_player:
-                        if found_opponent:
-                            legal_move_indices.add(idx)
-                        break
-                    else:
-                        break
-                    r += dr
-                    c += dc
-        return [Move(move_index) for move_index in legal_move_indices]
-    
+        moves_mask = self._current_moves_mask()
+        moves = self._moves
+        legal_moves: List[Move] = []
+        while moves_mask:
+            lowest_bit = moves_mask & -moves_mask
+            legal_moves.append(moves[lowest_bit.bit_length() - 1])
+            moves_mask ^= lowest_bit
+        return legal_moves
+
     def copy(self) -> "GameOthello":
         """Returns a deep copy of the game."""
-        new_game = GameOthello(self.size)
-        new_game.board = list(self.board)
+        new_game = self._blank_copy()
+        new_game.size = self.size
+        new_game.bitboard_x = self.bitboard_x
+        new_game.bitboard_o = self.bitboard_o
         new_game.current_player = self.current_player
+        new_game.last_move = self.last_move
+        new_game.empty_count = self.empty_count
+        new_game.initial_empty_count = self.initial_empty_count
+        new_game.variant_name = self.variant_name
+        new_game._moves = self._moves
+        new_game._zobrist_keys = self._zobrist_keys
+        new_game.zobrist_hash = self.zobrist_hash
+        new_game._moves_mask = self._moves_mask
+        new_game._undo_stack = []
+        self._copy_cache(new_game)
         return new_game
 
     def make_move(self, move: Move) -> "GameOthello":
@@ -96,48 +193,86 @@ class GameOthello(BaseGame):
         Creates and returns a new GameOthello object after making the move.
         Assumes the move is valid.
         """
+        new_game = self.copy()
+        new_game.apply_move(move)
+        return new_game
+
+    def apply_move(self, move: Move) -> None:
+        """
+        Plays the move in place. Assumes the move is valid.
+        If the opponent has no legal move after it, the opponent passes and the same player moves again.
+        """
+        self._clear_cache()
         move_idx = int(move)
-        if self.board[move_idx] != 0:
+        move_bit = 1 << move_idx
+        if (self.bitboard_x | self.bitboard_o) & move_bit:
             raise ValueError("Invalid move attempted on a non-empty cell.")
-        
-        directions = [(-1, -1), (-1, 0), (-1, 1),
-                      (0, -1),          (0, 1),
-                      (1, -1), (1, 0), (1, 1)]
-        
-        new_game = self.copy()
-        new_game.board[move_idx] = self.current_player
-        
-        row, col = divmod(move_idx, self.size)
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            to_flip = []
-            while 0 <= r < self.size and 0 <= c < self.size:
-                neighbor_idx = r * self.size + c
-                if new_game.board[neighbor_idx] == -self.current_player:
-                    to_flip.append(neighbor_idx)
-                elif new_game.board[neighbor_idx] == self.current_player:
-                    for flip_idx in to_flip:
-                        new_game.board[flip_idx] = self.current_player
-                    break
-                else:
-                    break
-                r += dr
-                c += dc
 
-        new_game.current_player = PlayerID(-self.current_player)  # Switch player
-        return new_game
-    
-    def get_winner(self) -> GameResult | None:
+        if self.current_player == 1:
+            own, opponent = self.bitboard_x, self.bitboard_o
+        else:
+            own, opponent = self.bitboard_o, self.bitboard_x
+        flips = self._flips_mask(move_idx, own, opponent)
+        own |= move_bit | flips
+        opponent &= ~flips
+
+        if self.current_player == 1:
+            self.bitboard_x, self.bitboard_o = own, opponent
+        else:
+            self.bitboard_o, self.bitboard_x = own, opponent
+        self._undo_stack.append((move_bit, flips, self.current_player, self.last_move, self.zobrist_hash))
+        self.last_move = move_idx
+        self.empty_count -= 1
+
+        # Update the hash with the new disc and the flipped ones, which change colour
+        x_keys, o_keys = self._zobrist_keys.x_keys, self._zobrist_keys.o_keys
+        self.zobrist_hash ^= x_keys[move_idx] if self.current_player == 1 else o_keys[move_idx]
+        while flips:
+            lowest_bit = flips & -flips
+            flip_idx = lowest_bit.bit_length() - 1
+            self.zobrist_hash ^= x_keys[flip_idx] ^ o_keys[flip_idx]
+            flips ^= lowest_bit
+
+        # Switch player, unless the opponent has to pass. The moves mask of the new player to move is kept
+        opponent_moves_mask = self._legal_moves_mask(opponent, own)
+        own_moves_mask = self._legal_moves_mask(own, opponent) if opponent_moves_mask == 0 else 0
+        if own_moves_mask:
+            self._moves_mask = own_moves_mask
+        else:
+            self._moves_mask = opponent_moves_mask
+            self.current_player = PlayerID(-self.current_player)
+            self.zobrist_hash ^= self._zobrist_keys.side_key
+
+    def undo_move(self) -> None:
+        """Reverts in place the last move played with apply_move."""
+        self._clear_cache()
+        move_bit, flips, player, self.last_move, self.zobrist_hash = self._undo_stack.pop()
+        self.empty_count += 1
+        if player == 1:
+            self.bitboard_x &= ~(move_bit | flips)
+            self.bitboard_o |= flips
+        else:
+            self.bitboard_o &= ~(move_bit | flips)
+            self.bitboard_x |= flips
+        self.current_player = player
+
+    def _compute_winner(self) -> GameResult | None:
         """
         Checks for a win. Returns 1 if 'X' wins, -1 if 'O' wins, 0 if no winner (draw),
         and None if the game is still ongoing.
         """
-        if self.get_legal_moves():
-            return None  # Game is still ongoing
-        
-        count_x = sum(1 for cell in self.board if cell == 1)
-        count_o = sum(1 for cell in self.board if cell == -1)
-        
+        # The game goes on as long as either player can move, which requires an empty square.
+        # Thanks to the passes, the player to move can move whenever either can, so it is checked first
+        if self.empty_count > 0:
+            if self._current_moves_mask():
+                return None  # Game is still ongoing
+            own, opponent = (self.bitboard_x, self.bitboard_o) if self.current_player == 1 else (self.bitboard_o, self.bitboard_x)
+            if self._legal_moves_mask(opponent, own):
+                return None  # Game is still ongoing
+
+        count_x = self.bitboard_x.bit_count()
+        count_o = self.bitboard_o.bit_count()
+
         if count_x > count_o:
             return GameResult(1)  # 'X' wins
         elif count_o > count_x:
@@ -145,6 +280,97 @@ class GameOthello(BaseGame):
         else:
             return GameResult(0)  # Draw
 
+    def state_key(self) -> int:
+        """Returns the compact key of the position: the two bitboards and the player to move."""
+        return self._pack_state_key(self.bitboard_x, self.bitboard_o, self.size * self.size, self.current_player)
+
+    @classmethod
+    def from_state_key(cls, state_key: int, *board_size: int) -> "GameOthello":
+        """Rebuilds a position from its state key, board_size being (size,)."""
+        game = cls(*board_size)
+        game.bitboard_x, game.bitboard_o, game.current_player = cls._unpack_state_key(state_key, game.size * game.size)
+        game.empty_count = game.size * game.size - (game.bitboard_x | game.bitboard_o).bit_count()
+        game.zobrist_hash = game._compute_zobrist_hash()
+        return game
+
+    def board_size(self) -> Tuple[int, ...]:
+        return (self.size,)
+
+    def _compute_zobrist_hash(self) -> int:
+        """Computes the Zobrist hash of the position from scratch."""
+        zobrist_hash = self._zobrist_keys.side_key if self.current_player == -1 else 0
+        for square_index in range(self.size * self.size):
+            if self.bitboard_x >> square_index & 1:
+                zobrist_hash ^= self._zobrist_keys.x_keys[square_index]
+            elif self.bitboard_o >> square_index & 1:
+                zobrist_hash ^= self._zobrist_keys.o_keys[square_index]
+        return zobrist_hash
+
+    def move_weights(self) -> List[float]:
+        """Returns the rollout weight of each square: corners first, and the squares next to them last."""
+        return _othello_square_weights(self.size)
+
+    def _clear_cache(self) -> None:
+        """Forgets the cached legal moves and winner, and the moves mask."""
+        super()._clear_cache()
+        self._moves_mask = None
+
+    def _current_moves_mask(self) -> int:
+        """Returns the bitboard of the legal moves of the player to move, computed once per position."""
+        moves_mask = self._moves_mask
+        if moves_mask is None:
+            if self.current_player == 1:
+                moves_mask = self._legal_moves_mask(self.bitboard_x, self.bitboard_o)
+            else:
+                moves_mask = self._legal_moves_mask(self.bitboard_o, self.bitboard_x)
+            self._moves_mask = moves_mask
+        return moves_mask
+
+    def _legal_moves_mask(self, own: int, opponent: int) -> int:
+        """
+        Returns the bitboard of the legal moves for the player owning `own`.
+        In each direction, the opponent discs adjacent to `own` are propagated along the line, and the
+        empty square right after such a line is a legal move.
+        """
+        directions, _ = _othello_tables(self.size)
+        empty = ~(own | opponent)
+        moves_mask = 0
+        for shift, wrap_mask in directions:
+            if shift > 0:
+                line = (own << shift) & wrap_mask & opponent
+                for _ in range(self.size - 3):
+                    line |= (line << shift) & wrap_mask & opponent
+                moves_mask |= (line << shift) & wrap_mask & empty
+            else:
+                line = (own >> -shift) & wrap_mask & opponent
+                for _ in range(self.size - 3):
+                    line |= (line >> -shift) & wrap_mask & opponent
+                moves_mask |= (line >> -shift) & wrap_mask & empty
+        return moves_mask
+
+    def _flips_mask(self, move_idx: int, own: int, opponent: int) -> int:
+        """
+        Returns the bitboard of the opponent discs flipped by playing at `move_idx`.
+        For each direction, the first non-opponent square along the ray is found with a bit scan;
+        if it holds an own disc, the squares before it on the ray are flipped.
+        """
+        directions, rays = _othello_tables(self.size)
+        square_rays = rays[move_idx]
+        flips = 0
+        for direction_index, (shift, _) in enumerate(directions):
+            ray = square_rays[direction_index]
+            blockers = ray & ~opponent
+            if not blockers:
+                continue
+            # the nearest blocker is the lowest bit when moving up the indices, the highest otherwise
+            if shift > 0:
+                nearest = blockers & -blockers
+            else:
+                nearest = 1 << (blockers.bit_length() - 1)
+            if nearest & own:
+                flips |= ray & ~rays[nearest.bit_length() - 1][direction_index] & ~nearest
+        return flips
+
 ###############################################################################
 #   --- Example Usage (Unchanged) ---
 #
@@ -155,11 +381,7 @@ if __name__ == "__main__":
     print("Legal Moves:", game.get_legal_moves())
     while not game.is_game_over():
         legal_moves = game.get_legal_moves()
-        move = legal_moves[0] if legal_moves else -1
-        if move == -1:
-            print("No legal moves available. Passing turn.")
-            game.current_player = PlayerID(-game.current_player)
-            continue
+        move = legal_moves[0]
         print(f"Player {player_id_to_marker(game.current_player)} plays move at index {move}")
         game = game.make_move(move)
         print(game)
@@ -0,0 +1,19 @@
+"""
+Registry of the games, by the name used on the command lines and in the game server.
+"""
+
+# stdlib imports
+from typing import Callable, Dict
+
+# local imports
+from src.bases.base_game import BaseGame
+from src.games.game_tictactoe import GameTicTacToe
+from src.games.game_connect4 import GameConnect4
+from src.games.game_othello import GameOthello
+
+# Maps each game name to a factory of its initial position
+GAME_FACTORIES: Dict[str, Callable[[], BaseGame]] = {
+    "tictactoe": GameTicTacToe,
+    "connect4": GameConnect4,
+    "othello": GameOthello,
+}
@@ -1,14 +1,42 @@
 # stdlib imports
+import functools
 import random
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # pip imports
 import colorama
 
 # local imports
 from src.bases.base_game import BaseGame
-from src.bases.move import Move
+from src.bases.move import Move, move_table
 from src.bases.types import GameResult, PlayerID
+from src.bases.zobrist import zobrist_keys
+
+###############################################################################
+#   Precomputed winning lines
+#
+@functools.lru_cache(maxsize=None)
+def _lines_through_squares(size: int) -> List[List[Tuple[int, ...]]]:
+    """
+    Returns, for each square of a board of the given size, the winning lines (row, column and diagonals)
+    going through it, as tuples of square indices. Computed once per size.
+    """
+    lines: List[Tuple[int, ...]] = []
+    # Rows
+    for i in range(size):
+        lines.append(tuple(range(i * size, (i + 1) * size)))
+    # Columns
+    for i in range(size):
+        lines.append(tuple(range(i, size * size, size)))
+    # Diagonals
+    lines.append(tuple(range(0, size * size, size + 1)))
+    lines.append(tuple(range(size - 1, size * size - 1, size - 1)))
+
+    lines_through_squares: List[List[Tuple[int, ...]]] = [[] for _ in range(size * size)]
+    for line in lines:
+        for square_index in line:
+            lines_through_squares[square_index].append(line)
+    return lines_through_squares
 
 ###############################################################################
 #   Represents the state and rules of a Tic-Tac-Toe game.
@@ -24,6 +52,16 @@ class GameTicTacToe(BaseGame):
         self.board: List[int] = [0] * (size * size)
         # 1: 'X', -1: 'O'
         self.current_player: PlayerID = PlayerID(1)
+        self.last_move: int | None = None
+        self.empty_count: int = size * size
+        self.initial_empty_count: int = self.empty_count
+        self.variant_name: str = f"tictactoe_{size}x{size}"
+        # Interned moves, indexed by square
+        self._moves: Tuple[Move, ...] = move_table(size * size)
+        self._zobrist_keys = zobrist_keys("tictactoe", size * size)
+        self.zobrist_hash: int = 0
+        # (square played, previous last move) for each move played with apply_move, most recent last
+        self._undo_stack: List[Tuple[int, int | None]] = []
 
     def __repr__(self) -> str:
         """Prints a human-readable board representation, showing move indices on empty cells."""
@@ -45,15 +83,26 @@ class GameTicTacToe(BaseGame):
                 output += "--" + "+---" * (self.size - 1) + "\n"
         return output
 
-    def get_legal_moves(self) -> List[Move]:
+    def _generate_legal_moves(self) -> List[Move]:
         """Returns a list of indices (0-8) where moves can be made."""
-        return [Move(i) for i, cell in enumerate(self.board) if cell == 0]
+        moves = self._moves
+        return [moves[i] for i, cell in enumerate(self.board) if cell == 0]
     
     def copy(self) -> "GameTicTacToe":
         """Returns a deep copy of the current game state."""
-        new_game = GameTicTacToe(self.size)
+        new_game = self._blank_copy()
+        new_game.size = self.size
         new_game.board = list(self.board)  # Deep copy the board
         new_game.current_player = self.current_player
+        new_game.last_move = self.last_move
+        new_game.empty_count = self.empty_count
+        new_game.initial_empty_count = self.initial_empty_count
+        new_game.variant_name = self.variant_name
+        new_game._moves = self._moves
+        new_game._zobrist_keys = self._zobrist_keys
+        new_game.zobrist_hash = self.zobrist_hash
+        new_game._undo_stack = []
+        self._copy_cache(new_game)
         return new_game
 
     def make_move(self, move: Move) -> "GameTicTacToe":
@@ -61,47 +110,114 @@ class GameTicTacToe(BaseGame):
         Creates and returns a new TicTacToe object after making the move.
         Assumes the move is valid.
         """
+        # Create a new game state
+        new_game = self.copy()
+        new_game.apply_move(move)
+        return new_game
+
+    def apply_move(self, move: Move) -> None:
+        """Plays the move in place. Assumes the move is valid."""
+        self._clear_cache()
         move_idx = int(move)
         if self.board[move_idx] != 0:
             raise ValueError("Invalid move attempted on a non-empty cell.")
-            
-        # Create a new game state
-        new_game = self.copy()
+
         # Play the move
-        new_game.board[move_idx] = self.current_player
+        self.board[move_idx] = self.current_player
+        self._undo_stack.append((move_idx, self.last_move))
+        self.last_move = move_idx
+        self.empty_count -= 1
+        self.zobrist_hash ^= self._zobrist_square_key(move_idx, self.current_player) ^ self._zobrist_keys.side_key
         # Switch player
-        new_game.current_player = PlayerID(-self.current_player)
-        return new_game
+        self.current_player = PlayerID(-self.current_player)
+
+    def undo_move(self) -> None:
+        """Reverts in place the last move played with apply_move."""
+        self._clear_cache()
+        move_idx, self.last_move = self._undo_stack.pop()
+        self.board[move_idx] = 0
+        self.empty_count += 1
+        self.current_player = PlayerID(-self.current_player)
+        self.zobrist_hash ^= self._zobrist_square_key(move_idx, self.current_player) ^ self._zobrist_keys.side_key
+
+    def _zobrist_square_key(self, square_index: int, player: PlayerID) -> int:
+        """Returns the Zobrist key of a mark of the player on the square."""
+        return self._zobrist_keys.x_keys[square_index] if player == 1 else self._zobrist_keys.o_keys[square_index]
+
+    def _compute_zobrist_hash(self) -> int:
+        """Computes the Zobrist hash of the position from scratch."""
+        zobrist_hash = self._zobrist_keys.side_key if self.current_player == -1 else 0
+        for square_index, cell in enumerate(self.board):
+            if cell != 0:
+                zobrist_hash ^= self._zobrist_square_key(square_index, PlayerID(cell))
+        return zobrist_hash
+
+    def tactical_moves(self) -> List[Move]:
+        """Returns the squares winning at once for the player to move, or else the squares blocking an immediate win of the opponent."""
+        lines_through_squares = _lines_through_squares(self.size)
+        board = self.board
+        empty_squares = [square_index for square_index, cell in enumerate(board) if cell == 0]
+        for player in (self.current_player, -self.current_player):
+            target_squares = [
+                square_index
+                for square_index in empty_squares
+                if any(all(board[line_index] == player for line_index in line if line_index != square_index) for line in lines_through_squares[square_index])
+            ]
+            if target_squares:
+                return [self._moves[square_index] for square_index in target_squares]
+        return []
 
-    def get_winner(self) -> GameResult | None:
+    def state_key(self) -> int:
+        """Returns the compact key of the position: the 'X' and 'O' bits of each square and the player to move."""
+        bitboard_x = bitboard_o = 0
+        for square_index, cell in enumerate(self.board):
+            if cell == 1:
+                bitboard_x |= 1 << square_index
+            elif cell == -1:
+                bitboard_o |= 1 << square_index
+        return self._pack_state_key(bitboard_x, bitboard_o, self.size * self.size, self.current_player)
+
+    @classmethod
+    def from_state_key(cls, state_key: int, *board_size: int) -> "GameTicTacToe":
+        """Rebuilds a position from its state key, board_size being (size,)."""
+        game = cls(*board_size)
+        bitboard_x, bitboard_o, game.current_player = cls._unpack_state_key(state_key, game.size * game.size)
+        for square_index in range(game.size * game.size):
+            if bitboard_x >> square_index & 1:
+                game.board[square_index] = 1
+            elif bitboard_o >> square_index & 1:
+                game.board[square_index] = -1
+        game.empty_count = game.board.count(0)
+        game.zobrist_hash = game._compute_zobrist_hash()
+        return game
+
+    def board_size(self) -> Tuple[int, ...]:
+        return (self.size,)
+
+    def _compute_winner(self) -> GameResult | None:
         """
         Checks for a win. Returns 1 if 'X' wins, -1 if 'O' wins, 0 if no winner,
         and None if the game is still ongoing.
+
+        Only the lines through the last move can have been completed, so only those are checked.
         """
-        
-        # Check rows, columns, and diagonals
-        lines: List[List[int]] = []
-        # Rows
-        for i in range(self.size):
-            lines.append(self.board[i * self.size : (i + 1) * self.size])
-        # Columns
-        for i in range(self.size):
-            lines.append(self.board[i::self.size])
-        # Diagonals (Specific logic for 3x3, but robust for the standard case)
-        diag1 = self.board[::self.size + 1]
-        diag2 = self.board[self.size - 1: self.size * self.size - 1: self.size - 1]
-            
-        lines.append(diag1)
-        lines.append(diag2)
-        
-        for line in lines:
-            if sum(line) == self.size:
-                return GameResult(1)  # 'X' wins
-            if sum(line) == -self.size:
-                return GameResult(-1)  # 'O' wins
+        lines_through_squares = _lines_through_squares(self.size)
+        if self.last_move is None:
+            # No known last move: check every line on the board
+            squares_to_check = range(self.size * self.size)
+        else:
+            squares_to_check = (self.last_move,)
+
+        for square_index in squares_to_check:
+            player = self.board[square_index]
+            if player == 0:
+                continue
+            for line in lines_through_squares[square_index]:
+                if all(self.board[line_index] == player for line_index in line):
+                    return GameResult(player)
 
         # Check for draw (if no moves left)
-        if not self.get_legal_moves():
+        if self.empty_count == 0:
             return GameResult(0)  # Draw
 
         return None # Game is still ongoing
@@ -30,9 +30,8 @@ class PlayerHuman(BasePlayer):
         print(f"👤 Your Turn ({self.marker}). Legal moves are: {[int(move) for move in legal_moves]}")
         while True:
             try:
-                legal_moves = game.get_legal_moves()
-                # sort the legal moves for better display
-                legal_moves.sort(key=lambda move: int(move))
+                # sort the legal moves for better display, in a new list as the game's list is shared
+                legal_moves = sorted(game.get_legal_moves(), key=lambda move: int(move))
 
                 # Show a terminal menu for move selection
                 menu_options = [str(move) for move in legal_moves]
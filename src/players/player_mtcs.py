@@ -1,14 +1,29 @@
 # stdlib imports
+import json
 import math
+import multiprocessing
 import random
+from array import array
+from multiprocessing import shared_memory
+import threading
+import time
 import typing
-from typing import Dict, List, Optional, Tuple
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple
 
 # local imports
 from src.bases.move import Move
-from src.bases.types import PlayerID, PlayerMarker, player_id_to_marker
+from src.bases.types import GameResult, PlayerID, PlayerMarker, PlayoutOutcomes, player_id_to_marker
 from src.bases.base_player import BasePlayer
 from src.bases.base_game import BaseGame
+from src.book.opening_book import OpeningBook
+from src.rollouts.rollout_policies import RandomRolloutPolicy, RolloutPolicy, create_rollout_policy
+
+# Statistics of the root children after a search: maps move (int) to (visits, wins)
+RootStats = Dict[int, Tuple[int, float]]
+# A playout recorded for RAVE: its winner, and the (player, move) of each move played, in order
+PlayoutRecord = Tuple[int, List[Tuple[PlayerID, int]]]
 
 ###############################################################################
 #   MCTS Tree Node
@@ -21,25 +36,67 @@ class MCTSNode:
         self.game_state: BaseGame = game_state
         self.parent: Optional['MCTSNode'] = parent
         self.parent_move: Optional[int] = parent_move # The move that led to this state
+        # The player who made the move leading to this state. Usually the opponent of the player to move,
+        # but not after a pass (e.g. in Othello), so it is taken from the parent state.
+        self.player_just_moved: PlayerID = parent.game_state.current_player if parent is not None else PlayerID(-game_state.current_player)
         self.children: Dict[int, 'MCTSNode'] = {}    # Maps move (int) to child node
         self.wins: float = 0.0                      # Total wins from this node's perspective (1 for win, 0.5 for draw, 0 for loss)
         self.visits: int = 0                        # Total number of times this node has been visited
+        # The game state never changes, so its winner and legal moves are computed once
+        self.winner: GameResult | None = game_state.get_winner()
+        self.is_terminal: bool = self.winner is not None
+        # Game result of the state under perfect play once proven by the solver, None while unknown
+        self.proven: GameResult | None = self.winner
+        # Legal moves without a child node yet, in no particular order
+        self.untried_moves: List[int] = [] if self.is_terminal else [int(move) for move in game_state.get_legal_moves()]
+        # RAVE all-moves-as-first statistics, for the player to move: maps a move to the visits and wins of the
+        # simulations which played it later on. Only allocated by a search with RAVE enabled
+        self.amaf_visits: Dict[int, int] | None = None
+        self.amaf_wins: Dict[int, float] | None = None
     
     def is_fully_expanded(self) -> bool:
         """Checks if all legal moves from this state have corresponding child nodes."""
-        return len(self.children) == len(self.game_state.get_legal_moves())
+        return not self.untried_moves
+
+    def count_nodes(self) -> int:
+        """Returns the number of distinct nodes reachable from this node, itself included. A transposition table may share a node between parents."""
+        seen_ids = {id(self)}
+        nodes_to_visit: List[MCTSNode] = [self]
+        while nodes_to_visit:
+            for child in nodes_to_visit.pop().children.values():
+                if id(child) not in seen_ids:
+                    seen_ids.add(id(child))
+                    nodes_to_visit.append(child)
+        return len(seen_ids)
 
-    def unexpanded_moves(self) -> List[int]:
-        """Returns a list of legal moves that do not yet have a child node."""
-        all_move_index = set(int(move) for move in self.game_state.get_legal_moves())
-        expanded_move_indices = set(self.children.keys())
-        return list(all_move_index - expanded_move_indices)
+    def update_proven(self) -> bool:
+        """
+        Tries to prove the node from its children, minimax-style: it is won by the player to move if any child is,
+        and once fully expanded with every child proven, it takes the best of their results for the player to move.
+        Returns True if the node is proven.
+        """
+        player_to_move = self.game_state.current_player
+        child_results: List[GameResult | None] = [child.proven for child in self.children.values()]
+        if player_to_move in child_results:
+            self.proven = GameResult(player_to_move)
+            return True
+        if self.untried_moves or not child_results or None in child_results:
+            return False
+        self.proven = max(typing.cast(List[GameResult], child_results), key=lambda result: result * player_to_move)
+        return True
 
-    def best_uct_child(self, c_param: float = 1.4) -> Tuple[int, 'MCTSNode']:
+    def best_uct_child(self, c_param: float = 1.4, rave_k: float = 0.0) -> Tuple[int, 'MCTSNode'] | None:
         """
         Selects the child node with the highest UCT1 (Upper Confidence Bound 1 applied to trees) value.
         UCT1 formula: (wins / visits) + c * sqrt(ln(parent_visits) / visits)
+        Proven children are skipped, as searching them cannot change their result. Returns None if they all are.
+
+        With RAVE (rave_k > 0), the win rate is blended with the all-moves-as-first win rate of the move,
+        with the weight beta = sqrt(rave_k / (3 * visits + rave_k)): RAVE leads while the child has few visits,
+        and fades out once it has many more than rave_k.
         """
+        amaf_visits = self.amaf_visits if rave_k > 0 else None
+        amaf_wins = self.amaf_wins
         log_parent_visits = math.log(self.visits)
         
         # We want to maximize the UCT score
@@ -47,6 +104,8 @@ class MCTSNode:
         best_move_node: Optional[Tuple[int, MCTSNode]] = None
 
         for move, child in self.children.items():
+            if child.proven is not None:
+                continue
             if child.visits == 0:
                 # Prioritize unvisited nodes for expansion
                 score = float('inf') 
@@ -56,6 +115,9 @@ class MCTSNode:
                 
                 # UCT calculation: win_rate + exploration_term
                 win_rate = child.wins / child.visits
+                if amaf_visits is not None and amaf_wins is not None and move in amaf_visits:
+                    beta = math.sqrt(rave_k / (3 * child.visits + rave_k))
+                    win_rate = (1.0 - beta) * win_rate + beta * amaf_wins[move] / amaf_visits[move]
                 exploration_term = c_param * math.sqrt(log_parent_visits / child.visits)
                 score = win_rate + exploration_term
             
@@ -63,11 +125,447 @@ class MCTSNode:
                 best_score = score
                 best_move_node = (move, child)
         
-        if best_move_node is None:
-             raise Exception("No children found for UCT selection, this should not happen in a non-terminal node.")
-
         return best_move_node
     
+###############################################################################
+#   Search Budget
+#
+class SearchBudget:
+    """
+    Decides when a search stops: after a fixed number of simulations, or at a deadline.
+
+    With a deadline, the search also stops early once the most visited root child cannot be overtaken:
+    the remaining simulations, estimated from the simulation rate so far, are fewer than its lead in visits.
+    """
+    early_stop_interval: int = 16
+    """number of simulations between two early stopping checks, as they scan the root children"""
+
+    def __init__(
+        self,
+        simulations: int,
+        time_budget_ms: float | None = None,
+        visits_per_simulation: int = 1,
+        stop_event: threading.Event | None = None,
+    ):
+        self.simulations: int = simulations
+        self.visits_per_simulation: int = visits_per_simulation
+        self.stop_event: threading.Event | None = stop_event # Stops the search as soon as it is set
+        self.time_start: float = time.perf_counter()
+        self.deadline: float | None = None if time_budget_ms is None else self.time_start + time_budget_ms / 1000.0
+        self.simulations_done: int = 0
+
+    def count_simulation(self) -> None:
+        """Records that one more simulation has been started."""
+        self.simulations_done += 1
+
+    def is_exhausted(self, root_child_visits: Callable[[], Iterable[int]]) -> bool:
+        """
+        Returns True if the search should stop.
+        `root_child_visits` returns the visits of every root child, unexpanded ones counting as 0; it is only called
+        for the early stopping checks.
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        if self.deadline is None:
+            return self.simulations_done >= self.simulations
+
+        time_now = time.perf_counter()
+        if time_now >= self.deadline:
+            return True
+        if self.simulations_done == 0 or self.simulations_done % self.early_stop_interval != 0:
+            return False
+
+        child_visits = sorted(root_child_visits(), reverse=True)
+        if len(child_visits) <= 1:
+            return True  # A single legal move, no need to search
+        simulation_rate = self.simulations_done / (time_now - self.time_start)
+        remaining_visits = simulation_rate * (self.deadline - time_now) * self.visits_per_simulation
+        return child_visits[0] - child_visits[1] > remaining_visits
+
+###############################################################################
+#   Search Statistics
+#
+class SearchStats:
+    """
+    Statistics of one search, available as PlayerMCTS.last_stats after each get_move.
+
+    The phase timings are cumulative wall times; with several threads they are summed over the threads,
+    and with several worker processes they are summed over the workers.
+    """
+    def __init__(self) -> None:
+        self.simulations: int = 0
+        self.playouts: int = 0
+        self.playout_plies: int = 0 # Plies played by the Python playouts, vectorised playouts are not counted
+        self.select_time: float = 0.0
+        self.expand_time: float = 0.0
+        self.simulate_time: float = 0.0
+        self.backpropagate_time: float = 0.0
+        self.total_time: float = 0.0
+        self.tree_size: int = 0 # Nodes of the searched tree, including those kept from a previous search
+        self.tree_full: bool = False # The shared tree ran out of nodes, so some leaves were simulated without being expanded
+        self.max_depth: int = 0
+        self.root_children: Dict[int, Tuple[int, float]] = {} # Maps move (int) to (visits, win rate)
+        self.proven_moves: Dict[int, int] = {} # Maps the root moves proven by the solver to their result for the player to move: 1 win, 0 draw, -1 loss
+        self.move: int | None = None # The move played
+        self.from_book: bool = False # The move was played from the opening book, without searching
+
+    @property
+    def average_playout_length(self) -> float:
+        """Average number of plies of a Python playout."""
+        return self.playout_plies / self.playouts if self.playouts > 0 else 0.0
+
+    def record_simulation(self, select_time: float, expand_time: float, simulate_time: float, backpropagate_time: float, depth: int) -> None:
+        """Adds the phase timings of one simulation, whose selected node is at the given depth."""
+        self.simulations += 1
+        self.select_time += select_time
+        self.expand_time += expand_time
+        self.simulate_time += simulate_time
+        self.backpropagate_time += backpropagate_time
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def merge(self, other: "SearchStats") -> None:
+        """Adds the statistics of another search of the same position, e.g. from another worker."""
+        self.simulations += other.simulations
+        self.playouts += other.playouts
+        self.playout_plies += other.playout_plies
+        self.select_time += other.select_time
+        self.expand_time += other.expand_time
+        self.simulate_time += other.simulate_time
+        self.backpropagate_time += other.backpropagate_time
+        self.tree_size += other.tree_size
+        self.tree_full = self.tree_full or other.tree_full
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.proven_moves.update(other.proven_moves)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the statistics as a JSON-serialisable dict."""
+        return {
+            "simulations": self.simulations,
+            "playouts": self.playouts,
+            "average_playout_length": self.average_playout_length,
+            "select_time": self.select_time,
+            "expand_time": self.expand_time,
+            "simulate_time": self.simulate_time,
+            "backpropagate_time": self.backpropagate_time,
+            "total_time": self.total_time,
+            "tree_size": self.tree_size,
+            "tree_full": self.tree_full,
+            "max_depth": self.max_depth,
+            "root_children": {str(move): {"visits": visits, "win_rate": win_rate} for move, (visits, win_rate) in self.root_children.items()},
+            "proven_moves": {str(move): result for move, result in self.proven_moves.items()},
+            "move": self.move,
+            "from_book": self.from_book,
+        }
+
+
+class JsonlStatsWriter:
+    """A PlayerMCTS stats callback appending the statistics of each search as one JSON line to a file."""
+    def __init__(self, path: str):
+        self.path: str = path
+
+    def __call__(self, stats: SearchStats) -> None:
+        with open(self.path, "a") as stats_file:
+            stats_file.write(json.dumps(stats.to_dict()) + "\n")
+
+###############################################################################
+#   Transposition Table
+#
+class TranspositionTable:
+    """
+    Maps the Zobrist hash of a position to its MCTSNode, so that all the move orders reaching the same position
+    share one node and its statistics: the tree becomes a directed acyclic graph.
+
+    The table holds at most `max_size` nodes. When it is full, the least visited of the `eviction_sample` oldest
+    entries is evicted, and the other sampled entries get a second chance at the back of the table.
+    An evicted node stays in the tree, it is just no longer shared with new parents.
+    """
+    eviction_sample: int = 4
+
+    def __init__(self, max_size: int):
+        self.max_size: int = max_size
+        self._nodes: Dict[int, MCTSNode] = {}  # insertion ordered, oldest first
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, zobrist_hash: int) -> Optional[MCTSNode]:
+        """Returns the node of the position with this hash, or None if it is not in the table."""
+        return self._nodes.get(zobrist_hash)
+
+    def store(self, zobrist_hash: int, node: MCTSNode) -> None:
+        """Stores the node of the position with this hash, evicting an entry if the table is full."""
+        if len(self._nodes) >= self.max_size:
+            self._evict()
+        self._nodes[zobrist_hash] = node
+
+    def _evict(self) -> None:
+        """Evicts the least visited of the oldest entries, and moves the other sampled entries to the back."""
+        sampled_hashes = []
+        for zobrist_hash in self._nodes:
+            sampled_hashes.append(zobrist_hash)
+            if len(sampled_hashes) == self.eviction_sample:
+                break
+        evicted_hash = min(sampled_hashes, key=lambda zobrist_hash: self._nodes[zobrist_hash].visits)
+        for zobrist_hash in sampled_hashes:
+            node = self._nodes.pop(zobrist_hash)
+            if zobrist_hash != evicted_hash:
+                self._nodes[zobrist_hash] = node
+
+###############################################################################
+#   Array-backed MCTS Tree
+#
+class MCTSTree:
+    """
+    A compact MCTS tree stored as a struct of arrays: each node is an index into flat `array` buffers
+    holding its statistics, and no game state is stored.
+    The children of a node are allocated in one contiguous block when it is expanded.
+    The buffers are preallocated, and grow by doubling when full.
+    """
+    def __init__(self, capacity: int = 1024):
+        self._size: int = 0
+        self.capacity: int = capacity
+        self.visits = array("q", [0]) * capacity
+        self.wins = array("d", [0.0]) * capacity
+        self.parent = array("i", [-1]) * capacity
+        self.first_child = array("i", [-1]) * capacity  # -1 while the node is not expanded
+        self.child_count = array("i", [0]) * capacity
+        self.move = array("i", [-1]) * capacity  # The move that led to this node
+        self.player_just_moved = array("b", [0]) * capacity  # The player who made this move
+
+    @property
+    def size(self) -> int:
+        """Number of nodes in the tree."""
+        return self._size
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self._size = value
+
+    def _ensure_capacity(self, required_size: int) -> None:
+        """Doubles the capacity of the buffers until they can hold `required_size` nodes."""
+        if required_size <= self.capacity:
+            return
+        new_capacity = self.capacity
+        while new_capacity < required_size:
+            new_capacity *= 2
+        extra_count = new_capacity - self.capacity
+        self.visits.extend(array("q", [0]) * extra_count)
+        self.wins.extend(array("d", [0.0]) * extra_count)
+        self.parent.extend(array("i", [-1]) * extra_count)
+        self.first_child.extend(array("i", [-1]) * extra_count)
+        self.child_count.extend(array("i", [0]) * extra_count)
+        self.move.extend(array("i", [-1]) * extra_count)
+        self.player_just_moved.extend(array("b", [0]) * extra_count)
+        self.capacity = new_capacity
+
+    def add_root(self, player_just_moved: PlayerID) -> int:
+        """Adds the root node, and returns its index."""
+        self._ensure_capacity(self.size + 1)
+        root = self.size
+        self.player_just_moved[root] = player_just_moved
+        self.size += 1
+        return root
+
+    def add_children(self, node: int, moves: List[int], player_to_move: PlayerID) -> None:
+        """Expands the node with one child per move, played by `player_to_move`."""
+        self._ensure_capacity(self.size + len(moves))
+        first_child = self.size
+        for offset, move in enumerate(moves):
+            child = first_child + offset
+            self.parent[child] = node
+            self.move[child] = move
+            self.player_just_moved[child] = player_to_move
+        self.first_child[node] = first_child
+        self.child_count[node] = len(moves)
+        self.size += len(moves)
+
+    def expand(self, node: int, moves: List[int], player_to_move: PlayerID) -> bool:
+        """Expands the node unless it already is, and returns whether it has children, which a full fixed-size tree may prevent."""
+        if self.first_child[node] < 0:
+            self.add_children(node, moves, player_to_move)
+        return True
+
+    def best_uct_child(self, node: int, c_param: float = 1.4) -> int:
+        """
+        Returns the index of the child with the highest UCT1 value, an unvisited child being picked first.
+        UCT1 formula: (wins / visits) + c * sqrt(ln(parent_visits) / visits)
+        """
+        visits = self.visits
+        wins = self.wins
+        # An unvisited node only has unvisited children, which are picked before the log is needed
+        log_parent_visits = math.log(visits[node]) if visits[node] > 0 else 0.0
+        first_child = self.first_child[node]
+
+        best_score = -float('inf')
+        best_child = -1
+        for child in range(first_child, first_child + self.child_count[node]):
+            child_visits = visits[child]
+            if child_visits == 0:
+                return child
+            score = wins[child] / child_visits + c_param * math.sqrt(log_parent_visits / child_visits)
+            if score > best_score:
+                best_score = score
+                best_child = child
+
+        if best_child == -1:
+            raise Exception("No children found for UCT selection, this should not happen in a non-terminal node.")
+        return best_child
+
+    def apply_virtual_loss(self, node: int, virtual_loss: int) -> None:
+        """Adds visits without wins from the node up to the root, making the path look worse to the other searchers."""
+        current_node = node
+        while current_node >= 0:
+            self.visits[current_node] += virtual_loss
+            current_node = self.parent[current_node]
+
+    def backpropagate(self, node: int, outcomes: PlayoutOutcomes, virtual_loss: int = 0) -> None:
+        """
+        Updates visits and wins from the node up to the root, each from the perspective of the player who moved into the node.
+        A virtual loss applied to the path before the playout is removed at the same time.
+        """
+        playout_count = outcomes.total - virtual_loss
+        half_draws = 0.5 * outcomes.draws
+        current_node = node
+        while current_node >= 0:
+            self.visits[current_node] += playout_count
+            self.wins[current_node] += outcomes.wins_for(PlayerID(self.player_just_moved[current_node])) + half_draws
+            current_node = self.parent[current_node]
+
+    def child_visits(self, node: int) -> List[int]:
+        """Returns the visits of every child of the node."""
+        first_child = self.first_child[node]
+        return list(self.visits[first_child : first_child + self.child_count[node]])
+
+    def root_stats(self, root: int = 0) -> "RootStats":
+        """Returns the visits and wins of each child of the root."""
+        first_child = self.first_child[root]
+        return {
+            self.move[child]: (self.visits[child], self.wins[child])
+            for child in range(first_child, first_child + self.child_count[root])
+        }
+
+###############################################################################
+#   Shared MCTS Tree
+#
+class SharedMCTSTree(MCTSTree):
+    """
+    An MCTSTree whose arrays live in a multiprocessing.shared_memory block, so that several worker processes
+    grow a single tree, as threads do with a tree of MCTSNode.
+
+    The block has a fixed capacity: once it is full, the leaves are no longer expanded and their simulations only run playouts,
+    which the search reports in SearchStats.tree_full.
+    Writes are guarded by striped locks, node i by lock i % len(locks), each taken for one node at a time,
+    and the allocation of child blocks by a separate lock. Selection reads without locking: the children of a node
+    are fully written before its first_child index is published.
+    """
+    # Layout of the block after the size counter: (attribute, array type code), the 8-byte arrays first to keep every array aligned
+    _LAYOUT: Tuple[Tuple[str, Literal["q", "d", "i", "b"]], ...] = (
+        ("visits", "q"), ("wins", "d"),
+        ("parent", "i"), ("first_child", "i"), ("child_count", "i"), ("move", "i"),
+        ("player_just_moved", "b"),
+    )
+    _ITEM_SIZES: Dict[str, int] = {"q": 8, "d": 8, "i": 4, "b": 1}
+
+    def __init__(self, capacity: int, locks: List[Any], allocation_lock: Any, name: str | None = None):
+        """Creates a block holding `capacity` nodes, or attaches to the existing block `name`, e.g. in a worker process."""
+        self.capacity = capacity
+        self.locks: List[Any] = locks
+        self.allocation_lock: Any = allocation_lock
+        block_size = 8 + capacity * sum(self._ITEM_SIZES[type_code] for _, type_code in self._LAYOUT)
+        self.shared_memory = shared_memory.SharedMemory(name=name, create=name is None, size=block_size)
+        self._is_owner: bool = name is None
+        buffer = self.shared_memory.buf
+        assert buffer is not None
+        self._size_view = buffer[:8].cast("q")
+        offset = 8
+        for attribute, type_code in self._LAYOUT:
+            end = offset + capacity * self._ITEM_SIZES[type_code]
+            setattr(self, attribute, buffer[offset:end].cast(type_code))
+            offset = end
+
+    @property
+    def size(self) -> int:
+        """Number of nodes in the tree, counted in the block so that every process sees it."""
+        return self._size_view[0]
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self._size_view[0] = value
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block, to attach to it from another process."""
+        return self.shared_memory.name
+
+    def _ensure_capacity(self, required_size: int) -> None:
+        if required_size > self.capacity:
+            raise MemoryError(f"The shared MCTS tree is full ({self.capacity} nodes).")
+
+    def _reset_node(self, node: int) -> None:
+        """Clears the statistics left in a slot by a previous search."""
+        self.visits[node] = 0
+        self.wins[node] = 0.0
+        self.first_child[node] = -1
+        self.child_count[node] = 0
+
+    def reset(self, player_just_moved: PlayerID) -> int:
+        """Empties the tree for a new search, while no worker is searching it, and returns the index of the new root."""
+        self.size = 0
+        root = self.add_root(player_just_moved)
+        self._reset_node(root)
+        self.parent[root] = -1
+        return root
+
+    def expand(self, node: int, moves: List[int], player_to_move: PlayerID) -> bool:
+        with self.locks[node % len(self.locks)]:
+            # Another worker may have expanded the node since it was selected
+            if self.first_child[node] >= 0:
+                return True
+            with self.allocation_lock:
+                first_child = self.size
+                if first_child + len(moves) > self.capacity:
+                    return False
+                self.size = first_child + len(moves)
+            for offset, move in enumerate(moves):
+                child = first_child + offset
+                self._reset_node(child)
+                self.parent[child] = node
+                self.move[child] = move
+                self.player_just_moved[child] = player_to_move
+            self.child_count[node] = len(moves)
+            self.first_child[node] = first_child
+        return True
+
+    def apply_virtual_loss(self, node: int, virtual_loss: int) -> None:
+        locks = self.locks
+        current_node = node
+        while current_node >= 0:
+            with locks[current_node % len(locks)]:
+                self.visits[current_node] += virtual_loss
+            current_node = self.parent[current_node]
+
+    def backpropagate(self, node: int, outcomes: PlayoutOutcomes, virtual_loss: int = 0) -> None:
+        locks = self.locks
+        playout_count = outcomes.total - virtual_loss
+        half_draws = 0.5 * outcomes.draws
+        current_node = node
+        while current_node >= 0:
+            win_count = outcomes.wins_for(PlayerID(self.player_just_moved[current_node])) + half_draws
+            with locks[current_node % len(locks)]:
+                self.visits[current_node] += playout_count
+                self.wins[current_node] += win_count
+            current_node = self.parent[current_node]
+
+    def close(self) -> None:
+        """Detaches from the block, and frees it if this process created it."""
+        for attribute, _ in self._LAYOUT:
+            getattr(self, attribute).release()
+        self._size_view.release()
+        self.shared_memory.close()
+        if self._is_owner:
+            self.shared_memory.unlink()
+
 ###############################################################################
 #   MCTS Player Implementation
 #
@@ -75,120 +573,773 @@ class PlayerMCTS(BasePlayer):
     """
     An AI player that uses Monte Carlo Tree Search to determine the best move.
     """
-    def __init__(self, player_id: PlayerID, simulations: int = 1000, c_param: float = 1.4, seed: int | None = None):
+    virtual_loss: int = 3
+    """Visits temporarily added to the nodes being searched by a thread, so that other threads pick other branches"""
+    shared_tree_lock_count: int = 64
+    """Number of striped locks guarding the nodes of a SharedMCTSTree"""
+    shared_tree_max_capacity: int = 1 << 21
+    """Upper bound of the nodes of a SharedMCTSTree, whose block is allocated up front: about 70 MB"""
+
+    def __init__(
+        self,
+        player_id: PlayerID,
+        simulations: int = 1000,
+        c_param: float = 1.4,
+        seed: int | None = None,
+        workers: int = 1,
+        rollouts_per_leaf: int = 1,
+        threads: int = 1,
+        tree_storage: str = "object",
+        transposition_table_size: int = 0,
+        time_budget_ms: float | None = None,
+        reuse_tree: bool = False,
+        ponder: bool = False,
+        playout_backend: str = "python",
+        rave_k: float = 0.0,
+        stats_callback: Callable[[SearchStats], None] | None = None,
+        opening_book: str | None = None,
+        book_plies: int = 8,
+        rollout_policy: str | RolloutPolicy = "random",
+    ):
         self.player_id: PlayerID = player_id
         self.marker: PlayerMarker = player_id_to_marker(player_id)
         self.simulations: int = simulations
+        self.time_budget_ms: float | None = time_budget_ms # If set, search until this deadline instead of a fixed number of simulations
         self.c_param: float = c_param # Exploration constant for UCT
+        self.rollouts_per_leaf: int = rollouts_per_leaf # Number of playouts run from each new leaf (leaf parallelisation)
+        self.playout_backend: str = playout_backend # "python" to play each playout in a loop, "numpy" to vectorise batches of playouts
+        if playout_backend not in ("python", "numpy"):
+            raise ValueError(f"Unknown playout backend: {playout_backend}")
+        if playout_backend == "numpy":
+            # NumPy is an optional dependency, only imported when requested
+            from src.rollouts import numpy_playouts
+            self._numpy_playouts = numpy_playouts
+        # How the playouts pick their moves, a RolloutPolicy or the name of a built-in one
+        self.rollout_policy: RolloutPolicy = create_rollout_policy(rollout_policy) if isinstance(rollout_policy, str) else rollout_policy
+        if playout_backend == "numpy" and not isinstance(self.rollout_policy, RandomRolloutPolicy):
+            raise ValueError("The numpy playout backend only plays uniformly random playouts.")
+        self.rave_k: float = rave_k # RAVE equivalence parameter: visits at which RAVE and UCT weigh the same, 0 to disable RAVE
+        if rave_k > 0 and (tree_storage != "object" or playout_backend == "numpy"):
+            raise ValueError("RAVE requires the object tree storage and the python playout backend.")
+        self.threads: int = threads # Number of threads searching a shared tree (tree parallelisation)
+        # "object" for a tree of MCTSNode, "array" for a compact MCTSTree, "shared" for a SharedMCTSTree grown by all the worker processes
+        self.tree_storage: str = tree_storage
+        if tree_storage not in ("object", "array", "shared"):
+            raise ValueError(f"Unknown tree storage: {tree_storage}")
+        if tree_storage != "object" and threads > 1:
+            raise ValueError(f"The {tree_storage} tree storage does not support multi-threaded search.")
+        self.transposition_table_size: int = transposition_table_size # Max number of positions shared through a transposition table, 0 to disable it
+        if tree_storage != "object" and transposition_table_size > 0:
+            raise ValueError(f"The {tree_storage} tree storage does not support transposition tables.")
+        self.workers: int = workers # Number of processes for root parallelisation, 1 to search in-process
+        self.ponder: bool = ponder # Keep searching in a background thread while the opponent thinks
+        self.reuse_tree: bool = reuse_tree or ponder # Keep the subtree of the played moves between calls to get_move
+        if self.reuse_tree and (workers > 1 or tree_storage != "object"):
+            raise ValueError("Tree reuse and pondering require an in-process tree of MCTSNode.")
         self.rnd_generator = random.Random()
         if seed is not None:
             self.rnd_generator.seed(seed)
+        self._executor: ProcessPoolExecutor | None = None
+        # The shared tree, if any, and the finalizer stopping the worker processes and freeing the shared tree,
+        # run by close() or when the player is garbage collected
+        self._shared_tree: SharedMCTSTree | None = None
+        self._executor_finalizer: weakref.finalize | None = None
+        # Simulations per second of the last shared tree search, and whether it filled the tree, to size the next one
+        self._shared_tree_simulation_rate: float | None = None
+        self._shared_tree_was_full: bool = False
+        # Statistics of the last search, and a hook called with them after each search, e.g. a JsonlStatsWriter
+        self.last_stats: SearchStats | None = None
+        self.stats_callback: Callable[[SearchStats], None] | None = stats_callback
+        # Counters read by the searches to fill their statistics
+        self._playout_ply_count: int = 0
+        self._created_node_count: int = 0
+        # Positions up to `book_plies` are first looked up in the opening book, and the searched ones are merged into it
+        self.opening_book: str | None = opening_book # Path of the SQLite opening book, None to disable it
+        self.book_plies: int = book_plies
+        self._book: OpeningBook | None = OpeningBook(opening_book) if opening_book is not None else None
+        # The subtree kept between moves, rooted at the state after our last move
+        self._kept_root: MCTSNode | None = None
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_stop_event: threading.Event = threading.Event()
 
 
     def get_move(self, game: BaseGame) -> Move:
         """
-        Runs the MCTS algorithm for a fixed number of simulations and returns the
-        best move based on the most visited child node.
+        Runs the MCTS algorithm for a fixed number of simulations, or until the time budget is spent,
+        and returns the best move based on the most visited child node.
+        With an opening book, positions of the first `book_plies` plies are played from the book when it holds
+        at least as many simulations as we would run, and our own searches of them are merged into the book.
         """
         if game.is_game_over():
             raise Exception("Cannot get move from a terminal game state.")
 
-        # 1. Initialize the root of the MCTS tree
+        # The background search must not touch the kept tree, the random generator or the counters from here on,
+        # even if the move comes from the book
+        self.stop_pondering()
+        stats = SearchStats()
+        time_start = time.perf_counter()
+
+        # An opening searched at least as deeply as we would is played straight from the book
+        use_book = self._book is not None and game.ply <= self.book_plies
+        if use_book:
+            book_move = self._book_move(game, stats, time_start)
+            if book_move is not None:
+                return book_move
+
+        if not self.reuse_tree:
+            if self.tree_storage == "shared":
+                root_stats = self._search_shared_tree(game, stats)
+            elif self.workers > 1:
+                root_stats = self._search_root_parallel(game, stats)
+            else:
+                root_stats = self._search(game, self.simulations, stats)
+            # 5. Final Move Decision: Choose the move that leads to the most visited child
+            best_move = self._best_move(root_stats, stats.proven_moves)
+            self._publish_stats(stats, root_stats, best_move, time_start)
+            if use_book:
+                self._merge_into_book(game, stats.simulations, root_stats)
+            return best_move
+
+        # Continue the search in the subtree kept from the previous move, if it contains this state
+        root = self._find_kept_root(game) or MCTSNode(game)
+        kept_root_stats = self._root_stats(root)
+        self._search_tree(root, self.simulations, stats=stats)
+        root_stats = self._root_stats(root)
+        best_move = self._best_move(root_stats, stats.proven_moves)
+        self._publish_stats(stats, root_stats, best_move, time_start)
+        if use_book:
+            # The book only gets the visits of this search, not those the kept tree already had
+            search_root_stats: RootStats = {}
+            for move, (visits, wins) in root_stats.items():
+                kept_visits, kept_wins = kept_root_stats.get(move, (0, 0.0))
+                if visits > kept_visits:
+                    search_root_stats[move] = (visits - kept_visits, wins - kept_wins)
+            self._merge_into_book(game, stats.simulations, search_root_stats)
+
+        # Keep the subtree of the chosen move for the next call, and let the rest of the tree be freed
+        self._kept_root = root.children[int(best_move)]
+        self._kept_root.parent = None
+        if self.ponder and not self._kept_root.is_terminal:
+            self._start_pondering(self._kept_root)
+        return best_move
+
+    def _book_move(self, game: BaseGame, stats: SearchStats, time_start: float) -> Move | None:
+        """Returns the best move of the book entry of the position if it holds at least our number of simulations, else None."""
+        assert self._book is not None
+        book_entry = self._book.lookup(game)
+        if book_entry is None or book_entry.simulations < self.simulations or not book_entry.move_stats:
+            return None
+        best_move = self._best_move(book_entry.move_stats)
+        stats.from_book = True
+        self._publish_stats(stats, book_entry.move_stats, best_move, time_start)
+        # A kept tree would not follow the book move
+        self._kept_root = None
+        return best_move
+
+    def _merge_into_book(self, game: BaseGame, simulations: int, root_stats: RootStats) -> None:
+        """Adds the results of the search of the position to the opening book."""
+        assert self._book is not None
+        self._book.merge(game, simulations, root_stats)
+
+    def _publish_stats(self, stats: SearchStats, root_stats: RootStats, best_move: Move, time_start: float) -> None:
+        """Completes the statistics of the search, stores them as last_stats and passes them to the stats callback."""
+        stats.total_time = time.perf_counter() - time_start
+        stats.root_children = {move: (visits, wins / visits if visits > 0 else 0.0) for move, (visits, wins) in root_stats.items()}
+        stats.move = int(best_move)
+        self.last_stats = stats
+        if self.stats_callback is not None:
+            self.stats_callback(stats)
+
+    def stop_pondering(self) -> None:
+        """Stops the background search started after the last move, if any, and waits for it to finish."""
+        if self._ponder_thread is None:
+            return
+        self._ponder_stop_event.set()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+
+    def _start_pondering(self, root: MCTSNode) -> None:
+        """
+        Searches the subtree in a background thread while the opponent thinks, until stop_pondering is called
+        or a move's budget is spent. The simulations then depend on timing, so a seeded player is no longer reproducible.
+        """
+        self._ponder_stop_event = threading.Event()
+        self._ponder_thread = threading.Thread(target=self._search_tree, args=(root, self.simulations, self._ponder_stop_event), daemon=True)
+        self._ponder_thread.start()
+
+    def _find_kept_root(self, game: BaseGame) -> Optional[MCTSNode]:
+        """
+        Returns the node of the kept subtree matching the game state: the kept root itself if the opponent passed,
+        or the child for the opponent's reply. Returns None if there is no such node, e.g. in a new game.
+        """
+        kept_root = self._kept_root
+        self._kept_root = None
+        if kept_root is None:
+            return None
+        for node in [kept_root, *kept_root.children.values()]:
+            node_state = node.game_state
+            if type(node_state) is type(game) and node_state.zobrist_hash == game.zobrist_hash and node_state.current_player == game.current_player:
+                node.parent = None
+                return node
+        return None
+
+    def _search(self, game: BaseGame, simulations: int, stats: SearchStats | None = None) -> RootStats:
+        """Searches the game state with the given number of simulations, and returns the statistics of the root children."""
+        if self.tree_storage != "object":
+            return self._search_array(game, simulations, stats).root_stats()
         root = MCTSNode(game)
+        self._search_tree(root, simulations, stats=stats)
+        return self._root_stats(root)
+
+    def _search_tree(self, root: MCTSNode, simulations: int, stop_event: threading.Event | None = None, stats: SearchStats | None = None) -> None:
+        """Grows the tree of MCTSNode from the root, which may already have been searched, with the given number of simulations."""
+        stats = stats if stats is not None else SearchStats()
+        # A root kept from a previous search already has a subtree, which counts in the size of the searched tree
+        stats.tree_size += root.count_nodes() if root.children else 1
+        if self.threads > 1:
+            self._search_threaded(root, simulations, stop_event, stats)
+        else:
+            playout_ply_count_start = self._playout_ply_count
+            created_node_count_start = self._created_node_count
+            self._search_nodes(root, simulations, stop_event, stats)
+            stats.playout_plies += self._playout_ply_count - playout_ply_count_start
+            stats.tree_size += self._created_node_count - created_node_count_start
+        stats.playouts = stats.simulations * self.rollouts_per_leaf
+        stats.proven_moves = self._proven_moves(root)
+
+    def _search_nodes(self, root: MCTSNode, simulations: int, stop_event: threading.Event | None, stats: SearchStats) -> None:
+        """Grows the tree from the root with the given number of simulations, recording the phase timings in `stats`."""
+        transposition_table = self._create_transposition_table(root)
+        budget = self._create_budget(simulations, stop_event)
+        perf_counter = time.perf_counter
         
-        for _ in range(self.simulations):
+        # The search stops early once the solver proves the root
+        while root.proven is None and not budget.is_exhausted(lambda: self._root_child_visits(root)):
+            budget.count_simulation()
+            time_start = perf_counter()
             # A. Selection: Traverse down the tree using UCT until an unexpanded node
-            node = self._select_node(root)
+            path_moves: List[int] = []
+            path = self._select_path(root, path_moves)
+            node = path[-1]
+            time_selected = perf_counter()
             
-            # B. Expansion: Add a new child node (if not terminal)
-            if not node.game_state.is_game_over():
-                node = self._expand_node(node)
+            # B. Expansion: Add a new child node (if it has untried moves)
+            if not node.is_fully_expanded():
+                node = self._expand_node(node, transposition_table, path_moves)
+                path.append(node)
+            time_expanded = perf_counter()
 
-            # C. Simulation: Playout a random game from the new node
-            score = self._simulate(node.game_state)
+            # C. Simulation: Playout random games from the new node
+            playouts: List[PlayoutRecord] | None = [] if self.rave_k > 0 else None
+            outcomes = self._simulate_batch(node.game_state, self.rollouts_per_leaf, playouts)
+            time_simulated = perf_counter()
             
             # D. Backpropagation: Update wins/visits up the tree
-            self._backpropagate(node, score)
+            self._backpropagate(path, outcomes, playouts, path_moves)
+            time_end = perf_counter()
+
+            stats.record_simulation(time_selected - time_start, time_expanded - time_selected, time_simulated - time_expanded, time_end - time_simulated, len(path) - 1)
 
-        # 5. Final Move Decision: Choose the move that leads to the most visited child
-        return self._best_move(root)
+    def _create_budget(self, simulations: int, stop_event: threading.Event | None = None) -> SearchBudget:
+        """Returns the budget of a search starting now."""
+        return SearchBudget(simulations, self.time_budget_ms, visits_per_simulation=self.rollouts_per_leaf, stop_event=stop_event)
+
+    @staticmethod
+    def _root_child_visits(root: MCTSNode) -> List[int]:
+        """Returns the visits of every child of the root, including 0 for each untried move."""
+        return [child.visits for child in root.children.values()] + [0] * len(root.untried_moves)
+
+    def _create_transposition_table(self, root: MCTSNode) -> Optional[TranspositionTable]:
+        """Returns a new transposition table holding the root, or None if they are disabled."""
+        if self.transposition_table_size <= 0:
+            return None
+        transposition_table = TranspositionTable(self.transposition_table_size)
+        transposition_table.store(root.game_state.zobrist_hash, root)
+        return transposition_table
+
+    def _search_array(self, game: BaseGame, simulations: int, stats: SearchStats | None = None, tree: MCTSTree | None = None) -> MCTSTree:
+        """
+        Same search as _search_nodes, but the tree is a compact MCTSTree which stores no game state.
+        The state of a node is rebuilt by replaying the moves from the root on a single scratch state,
+        and the moves are undone after each simulation.
+
+        A SharedMCTSTree, rooted at index 0 at the game state, may be given instead of a new tree: it is then searched
+        concurrently with other processes, with a virtual loss on the path of each simulation.
+        """
+        stats = stats if stats is not None else SearchStats()
+        if tree is None:
+            tree = MCTSTree()
+            root = tree.add_root(PlayerID(-game.current_player))
+        else:
+            root = 0
+        virtual_loss = self.virtual_loss if isinstance(tree, SharedMCTSTree) else 0
+        scratch_game = game.copy()
+        budget = self._create_budget(simulations)
+        perf_counter = time.perf_counter
+        playout_ply_count_start = self._playout_ply_count
 
-    def _select_node(self, node: MCTSNode) -> MCTSNode:
-        """The Selection phase: Traverse the tree using UCT."""
-        while node.is_fully_expanded() and not node.game_state.is_game_over():
-            _, node = node.best_uct_child(self.c_param)
-        return node
+        while not budget.is_exhausted(lambda: tree.child_visits(root)):
+            budget.count_simulation()
+            time_start = perf_counter()
+            expand_time = 0.0
+            # A. Selection: Traverse down the tree using UCT until an unvisited node
+            node = root
+            depth = 0
+            while not scratch_game.is_game_over():
+                # B. Expansion: Allocate all the children at once, in random order, so that UCT picks the
+                # first unvisited one, i.e. a random unexpanded move
+                if tree.first_child[node] < 0:
+                    time_expand_start = perf_counter()
+                    legal_moves = [int(move) for move in scratch_game.get_legal_moves()]
+                    self.rnd_generator.shuffle(legal_moves)
+                    expanded = tree.expand(node, legal_moves, scratch_game.current_player)
+                    expand_time += perf_counter() - time_expand_start
+                    if not expanded:
+                        # The shared tree is full: simulate from the leaf
+                        stats.tree_full = True
+                        break
+                node = tree.best_uct_child(node, self.c_param)
+                scratch_game.apply_move(Move.of(tree.move[node]))
+                depth += 1
+                if tree.visits[node] == 0:
+                    break
+            time_selected = perf_counter()
 
-    def _expand_node(self, node: MCTSNode) -> MCTSNode:
-        """The Expansion phase: Select an unexpanded move and create a new child."""
-        unexpanded_moves = node.unexpanded_moves()
-        random_move_idx = self.rnd_generator.choice(unexpanded_moves)
+            # C. Simulation: Playout random games from the new node
+            if virtual_loss:
+                tree.apply_virtual_loss(node, virtual_loss)
+            outcomes = self._simulate_batch(scratch_game, self.rollouts_per_leaf)
+            time_simulated = perf_counter()
+
+            # D. Backpropagation: Update wins/visits up the tree
+            tree.backpropagate(node, outcomes, virtual_loss)
+
+            # Rewind the scratch state to the root
+            for _ in range(depth):
+                scratch_game.undo_move()
+            time_end = perf_counter()
+
+            stats.record_simulation(time_selected - time_start - expand_time, expand_time, time_simulated - time_selected, time_end - time_simulated, depth)
+
+        stats.playouts = stats.simulations * self.rollouts_per_leaf
+        stats.playout_plies += self._playout_ply_count - playout_ply_count_start
+        stats.tree_size = tree.size
+        return tree
+
+    def _search_threaded(self, root: MCTSNode, simulations: int, stop_event: threading.Event | None, stats: SearchStats) -> None:
+        """
+        Tree parallelisation: several threads search the same tree.
+
+        Selection, expansion and backpropagation are done under a lock shared by all threads, while the playouts,
+        which dominate the cost, run concurrently. This scales on free-threaded CPython, and stays correct with the GIL.
+        A virtual loss is added along the path of each in-flight simulation so that concurrent selections spread
+        across different branches.
+        """
+        transposition_table = self._create_transposition_table(root)
+        tree_lock = threading.Lock()
+        budget = self._create_budget(simulations, stop_event)
+
+        perf_counter = time.perf_counter
+
+        def search_thread(thread_player: PlayerMCTS) -> None:
+            while True:
+                with tree_lock:
+                    if root.proven is not None or budget.is_exhausted(lambda: self._root_child_visits(root)):
+                        return
+                    budget.count_simulation()
+                    time_start = perf_counter()
+                    path_moves: List[int] = []
+                    path = self._select_path(root, path_moves)
+                    node = path[-1]
+                    time_selected = perf_counter()
+                    if not node.is_fully_expanded():
+                        node = thread_player._expand_node(node, transposition_table, path_moves)
+                        path.append(node)
+                    self._apply_virtual_loss(path, self.virtual_loss)
+                    time_expanded = perf_counter()
+
+                playouts: List[PlayoutRecord] | None = [] if self.rave_k > 0 else None
+                outcomes = thread_player._simulate_batch(node.game_state, self.rollouts_per_leaf, playouts)
+                time_simulated = perf_counter()
+
+                with tree_lock:
+                    time_locked = perf_counter()
+                    self._apply_virtual_loss(path, -self.virtual_loss)
+                    self._backpropagate(path, outcomes, playouts, path_moves)
+                    stats.record_simulation(time_selected - time_start, time_expanded - time_selected, time_simulated - time_expanded, perf_counter() - time_locked, len(path) - 1)
+
+        # Each thread has its own random generator, seeded from ours
+        thread_players = [PlayerMCTS(self.player_id, seed=self.rnd_generator.getrandbits(64), **self._search_settings()) for _ in range(self.threads)]
+        search_threads = [threading.Thread(target=search_thread, args=(thread_player,)) for thread_player in thread_players]
+        for search_thread_handle in search_threads:
+            search_thread_handle.start()
+        for search_thread_handle in search_threads:
+            search_thread_handle.join()
+        for thread_player in thread_players:
+            stats.playout_plies += thread_player._playout_ply_count
+            stats.tree_size += thread_player._created_node_count
+
+    @staticmethod
+    def _apply_virtual_loss(path: List[MCTSNode], virtual_loss: int) -> None:
+        """Adds visits without wins to the nodes of the path, making it look worse to the other threads. A negative value removes it."""
+        for node in path:
+            node.visits += virtual_loss
+
+    def _search_root_parallel(self, game: BaseGame, stats: SearchStats) -> RootStats:
+        """
+        Root parallelisation: each worker process builds its own tree from the same root with an independent seed,
+        the simulations being split between the workers. The statistics of the root children are then summed.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._executor_finalizer = weakref.finalize(self, self._executor.shutdown)
+
+        # Seeds are drawn from our own generator, so a seeded player stays reproducible
+        futures = []
+        for worker_index in range(self.workers):
+            worker_simulations = self.simulations // self.workers + (1 if worker_index < self.simulations % self.workers else 0)
+            if worker_simulations == 0:
+                continue
+            worker_seed = self.rnd_generator.getrandbits(64)
+            futures.append(self._executor.submit(_search_worker, game, worker_simulations, worker_seed, self._search_settings()))
+
+        merged_stats: RootStats = {}
+        for future in futures:
+            worker_root_stats, worker_search_stats = future.result()
+            stats.merge(worker_search_stats)
+            for move, (visits, wins) in worker_root_stats.items():
+                merged_visits, merged_wins = merged_stats.get(move, (0, 0.0))
+                merged_stats[move] = (merged_visits + visits, merged_wins + wins)
+        return merged_stats
+
+    def _search_shared_tree(self, game: BaseGame, stats: SearchStats) -> RootStats:
+        """
+        Tree parallelisation across processes: the worker processes grow a single SharedMCTSTree from the same root,
+        the simulations being split between them. The statistics of the root children are read from the shared memory.
+        """
+        capacity = self._shared_tree_capacity(game)
+        if self._shared_tree is None or self._shared_tree.capacity < capacity:
+            self._create_shared_tree(capacity)
+        assert self._shared_tree is not None and self._executor is not None
+        tree = self._shared_tree
+        tree.reset(PlayerID(-game.current_player))
+        time_start = time.perf_counter()
+
+        # Seeds are drawn from our own generator, so that the workers play different playouts
+        futures = []
+        for worker_index in range(self.workers):
+            worker_simulations = self.simulations // self.workers + (1 if worker_index < self.simulations % self.workers else 0)
+            if worker_simulations == 0:
+                continue
+            worker_seed = self.rnd_generator.getrandbits(64)
+            futures.append(self._executor.submit(_shared_tree_worker, game, worker_simulations, worker_seed, self._search_settings()))
+        for future in futures:
+            stats.merge(future.result())
+        stats.tree_size = tree.size
+        self._shared_tree_simulation_rate = stats.simulations / max(time.perf_counter() - time_start, 1e-6)
+        self._shared_tree_was_full = stats.tree_full
+        return tree.root_stats()
+
+    def _shared_tree_capacity(self, game: BaseGame) -> int:
+        """
+        Returns the number of nodes of the shared tree to search the game state, up to shared_tree_max_capacity.
+        Each simulation expands at most one node, adding at most one child per empty square. With a time budget,
+        the simulations are estimated from the rate of the previous search, if any. The block cannot grow during
+        a search, so a tree filled by the previous search is at least doubled.
+        """
+        simulations = self.simulations
+        if self.time_budget_ms is not None and self._shared_tree_simulation_rate is not None:
+            simulations = math.ceil(self._shared_tree_simulation_rate * self.time_budget_ms / 1000.0)
+        capacity = 1 + simulations * max(1, game.empty_count)
+        if self._shared_tree is not None and self._shared_tree_was_full:
+            capacity = max(capacity, 2 * self._shared_tree.capacity)
+        return min(capacity, self.shared_tree_max_capacity)
+
+    def _create_shared_tree(self, capacity: int) -> None:
+        """Allocates a shared tree of the given capacity, and starts worker processes attached to it, freeing the previous ones."""
+        if self._executor_finalizer is not None:
+            self._executor_finalizer()
+        locks = [multiprocessing.Lock() for _ in range(self.shared_tree_lock_count)]
+        allocation_lock = multiprocessing.Lock()
+        self._shared_tree = SharedMCTSTree(capacity, locks, allocation_lock)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_attach_shared_tree,
+            initargs=(self._shared_tree.name, capacity, locks, allocation_lock),
+        )
+        self._executor_finalizer = weakref.finalize(self, _release_shared_tree, self._executor, self._shared_tree)
+
+    def _search_settings(self) -> Dict[str, Any]:
+        """Returns the keyword arguments configuring the search itself, to recreate an equivalent player."""
+        return {
+            "simulations": self.simulations,
+            "time_budget_ms": self.time_budget_ms,
+            "c_param": self.c_param,
+            "rollouts_per_leaf": self.rollouts_per_leaf,
+            "threads": self.threads,
+            "tree_storage": self.tree_storage,
+            "transposition_table_size": self.transposition_table_size,
+            "reuse_tree": self.reuse_tree,
+            "ponder": self.ponder,
+            "playout_backend": self.playout_backend,
+            "rollout_policy": self.rollout_policy,
+            "rave_k": self.rave_k,
+        }
+
+    @staticmethod
+    def _root_stats(root: MCTSNode) -> RootStats:
+        """Returns the visits and wins of each child of the root."""
+        return {move: (child.visits, child.wins) for move, child in root.children.items()}
+
+    def _select_path(self, root: MCTSNode, path_moves: List[int] | None = None) -> List[MCTSNode]:
+        """
+        The Selection phase: Traverse the tree using UCT.
+        Returns the path from the root to the selected node, as a node may have several parents with a transposition table.
+        The moves played along the path are appended to `path_moves`, if given: with a transposition table, the parent_move
+        of a node is only the move from its first parent.
+        """
+        node = root
+        path = [node]
+        while node.is_fully_expanded() and not node.is_terminal:
+            best_move_node = node.best_uct_child(self.c_param, self.rave_k)
+            if best_move_node is None:
+                # Every child was proven through another parent in the transposition table, so this node is proven too
+                node.update_proven()
+                break
+            if path_moves is not None:
+                path_moves.append(best_move_node[0])
+            node = best_move_node[1]
+            path.append(node)
+        return path
+
+    def _expand_node(self, node: MCTSNode, transposition_table: Optional[TranspositionTable] = None, path_moves: List[int] | None = None) -> MCTSNode:
+        """
+        The Expansion phase: Select an unexpanded move and create a new child.
+        With a transposition table, the child is the existing node of the resulting position, if any.
+        The move is appended to `path_moves`, if given.
+        """
+        # Swap a random untried move to the end of the list, and pop it
+        untried_moves = node.untried_moves
+        random_index = self.rnd_generator.randrange(len(untried_moves))
+        untried_moves[random_index], untried_moves[-1] = untried_moves[-1], untried_moves[random_index]
+        random_move_idx = untried_moves.pop()
         
-        random_move = Move(random_move_idx)
+        if path_moves is not None:
+            path_moves.append(random_move_idx)
+        random_move = Move.of(random_move_idx)
         new_game_state = node.game_state.make_move(random_move)
+        if transposition_table is not None:
+            # Share the node only if its statistics are from the same player's perspective, which a pass could change
+            shared_node = transposition_table.get(new_game_state.zobrist_hash)
+            if shared_node is not None and shared_node.player_just_moved == node.game_state.current_player:
+                node.children[random_move_idx] = shared_node
+                return shared_node
         new_node = MCTSNode(new_game_state, parent=node, parent_move=random_move_idx)
         node.children[random_move_idx] = new_node
+        self._created_node_count += 1
+        if transposition_table is not None:
+            transposition_table.store(new_game_state.zobrist_hash, new_node)
         
         return new_node
 
-    def _simulate(self, game: BaseGame) -> int:
+    def _simulate(self, game: BaseGame, played_moves: List[Tuple[PlayerID, int]] | None = None) -> int:
         """
         The Simulation (or Playout) phase: Play a random game until a terminal state.
-        Returns the winner (1, -1, or 0 for draw).
+        Returns the winner (1, -1, or 0 for draw). The (player, move) of each move played is appended to `played_moves`, if given.
+
+        The playout is played in place on a single scratch copy of the state, so no game object is allocated per ply.
         """
-        current_game = game
+        current_game = game.copy()
+        # Uniformly random moves are picked inline, as it is the most common policy and the cheapest one
+        choose_move = None if isinstance(self.rollout_policy, RandomRolloutPolicy) else self.rollout_policy.choose_move
         while not current_game.is_game_over():
             legal_moves = current_game.get_legal_moves()
             if not legal_moves: # Should be handled by is_game_over but good for safety
                 return 0
-            move = self.rnd_generator.choice(legal_moves)
-            current_game = current_game.make_move(move)
+            if choose_move is None:
+                move = self.rnd_generator.choice(legal_moves)
+            else:
+                move = choose_move(current_game, legal_moves, self.rnd_generator)
+            if played_moves is not None:
+                played_moves.append((current_game.current_player, int(move)))
+            current_game.apply_move(move)
 
-        # winner  = typing.cast(int, current_game.check_win())
+        # Every move fills one square
+        self._playout_ply_count += game.empty_count - current_game.empty_count
 
+        # winner  = typing.cast(int, current_game.check_win())
         return typing.cast(int, current_game.get_winner())   
 
-    def _backpropagate(self, node: MCTSNode, result: int) -> None:
-        """The Backpropagation phase: Update visits and wins up to the root."""
-        current_node = node
-        while current_node is not None:
-            current_node.visits += 1
+    def _simulate_batch(self, game: BaseGame, count: int, playouts: List[PlayoutRecord] | None = None) -> PlayoutOutcomes:
+        """
+        Plays `count` random playouts from the same state in one call, and returns how many each player won.
+        With the numpy backend, the playouts of the supported games are vectorised.
+        If `playouts` is given, the winner and the moves of each playout are appended to it, for RAVE.
+        """
+        if self.playout_backend == "numpy" and self._numpy_playouts.supports_numpy_playouts(game):
+            return self._numpy_playouts.numpy_playouts(game, count, seed=self.rnd_generator.getrandbits(64))
+        if playouts is None:
+            results = [self._simulate(game) for _ in range(count)]
+        else:
+            results = []
+            for _ in range(count):
+                played_moves: List[Tuple[PlayerID, int]] = []
+                results.append(self._simulate(game, played_moves))
+                playouts.append((results[-1], played_moves))
+        return PlayoutOutcomes(results.count(1), results.count(-1), results.count(0))
+
+    def _backpropagate(
+        self,
+        path: List[MCTSNode],
+        outcomes: PlayoutOutcomes,
+        playouts: List[PlayoutRecord] | None = None,
+        path_moves: List[int] | None = None,
+    ) -> None:
+        """
+        The Backpropagation phase: Update visits and wins along the selected path, up to the root.
+        A batch of playouts is backed up in a single pass, each playout counting as one visit.
+        With the recorded `playouts` and the moves played along the path, the RAVE statistics along the path are updated too.
+        """
+        playout_count = outcomes.total
+        for current_node in reversed(path):
+            current_node.visits += playout_count
             
             # Score is from the perspective of the player *who just played* to reach the current_node's state
-            # This player is current_node.game_state.current_player * -1
-            
-            # The result is the final winner (1, -1, or 0)
-            if result == 0:
-                score = 0.5 # Draw
-            elif result == current_node.game_state.current_player * -1:
-                score = 1.0 # Win
-            else:
-                score = 0.0 # Loss
+            # This player is current_node.player_just_moved
+            # A win scores 1, a draw 0.5 and a loss 0
+            current_node.wins += outcomes.wins_for(current_node.player_just_moved) + 0.5 * outcomes.draws
+
+        if playouts is not None and path_moves is not None:
+            self._backpropagate_amaf(path, path_moves, playouts)
+
+        # Back up the proven results: an ancestor can only be proven if the node below it just was
+        for current_node in reversed(path):
+            if current_node.proven is None and not current_node.update_proven():
+                break
+
+    @staticmethod
+    def _backpropagate_amaf(path: List[MCTSNode], path_moves: List[int], playouts: List[PlayoutRecord]) -> None:
+        """
+        Updates the all-moves-as-first statistics along the path: at each node, every move played afterwards
+        in the simulation by the player to move there, in the tree or in the playout, counts as if played first.
+        Only the first occurrence of a move counts, e.g. a Connect4 column played several times.
+        `path_moves` are the moves played from each node of the path to the next one.
+        """
+        tree_moves = [(node.player_just_moved, move) for node, move in zip(path[1:], path_moves)]
+        for winner, playout_moves in playouts:
+            moves_after_node = tree_moves + playout_moves
+            # Walk up the path, prepending the moves following each node, so that each move maps to its first player
+            first_players: Dict[int, PlayerID] = {}
+            next_index = len(moves_after_node)
+            for depth in range(len(path) - 1, -1, -1):
+                for player, move in reversed(moves_after_node[depth:next_index]):
+                    first_players[move] = player
+                next_index = depth
+
+                node = path[depth]
+                if node.is_terminal:
+                    continue
+                if node.amaf_visits is None or node.amaf_wins is None:
+                    node.amaf_visits, node.amaf_wins = {}, {}
+                amaf_visits, amaf_wins = node.amaf_visits, node.amaf_wins
+                player_to_move = node.game_state.current_player
+                score = 1.0 if winner == player_to_move else (0.5 if winner == 0 else 0.0)
+                for move, player in first_players.items():
+                    if player == player_to_move:
+                        amaf_visits[move] = amaf_visits.get(move, 0) + 1
+                        amaf_wins[move] = amaf_wins.get(move, 0.0) + score
 
-            current_node.wins += score
-            current_node = current_node.parent
+    @staticmethod
+    def _proven_moves(root: MCTSNode) -> Dict[int, int]:
+        """Returns the root moves proven by the solver, mapped to their result for the player to move: 1 win, 0 draw, -1 loss."""
+        player_to_move = root.game_state.current_player
+        return {move: child.proven * player_to_move for move, child in root.children.items() if child.proven is not None}
 
-    def _best_move(self, root: MCTSNode) -> Move:
+    def _best_move(self, root_stats: RootStats, proven_moves: Dict[int, int] | None = None) -> Move:
         """
         The final decision: Choose the move corresponding to the child with the most visits.
+        A move proven to win is played first, and moves proven to lose are avoided whenever possible.
         """
+        if proven_moves:
+            winning_moves = [move for move, result in proven_moves.items() if result == 1]
+            if winning_moves:
+                return Move.of(max(winning_moves, key=lambda move: root_stats.get(move, (0, 0.0))[0]))
+            root_stats = {move: move_stats for move, move_stats in root_stats.items() if proven_moves.get(move) != -1} or root_stats
+
         # We look for the most visited child, which is often more stable than the one with the highest win rate.
         best_visits = -1
         best_move_idx = -1
         
-        for move, child in root.children.items():
-            if child.visits > best_visits:
-                best_visits = child.visits
+        for move, (visits, _) in root_stats.items():
+            if visits > best_visits:
+                best_visits = visits
                 best_move_idx = move
                 
         if best_move_idx == -1:
             raise Exception("MCTS failed to find a move for the current state.")
             
-        return Move(best_move_idx)
+        return Move.of(best_move_idx)
+
+    def close(self) -> None:
+        """Stops pondering and the worker processes, frees the shared tree and closes the opening book. The player cannot be used afterwards."""
+        self.stop_pondering()
+        if self._executor_finalizer is not None:
+            self._executor_finalizer()
+        self._executor = None
+        self._executor_finalizer = None
+        self._shared_tree = None
+        if self._book is not None:
+            self._book.close()
+            self._book = None
 
     def copy(self) -> 'PlayerMCTS':
         """Create and return a copy of this player instance."""
-        new_player = PlayerMCTS(self.player_id, simulations=self.simulations, c_param=self.c_param)
+        new_player = PlayerMCTS(
+            self.player_id,
+            workers=self.workers,
+            stats_callback=self.stats_callback,
+            opening_book=self.opening_book,
+            book_plies=self.book_plies,
+            **self._search_settings(),
+        )
         # Preserve the random generator state
         new_player.rnd_generator.setstate(self.rnd_generator.getstate())
-        return new_player
\ No newline at end of file
+        return new_player
+
+###############################################################################
+#   Root parallelisation worker
+#
+def _search_worker(game: BaseGame, simulations: int, seed: int, search_settings: Dict[str, Any]) -> Tuple[RootStats, SearchStats]:
+    """Runs in a worker process: searches the game state with its own tree, and returns the root children statistics and the search statistics."""
+    player = PlayerMCTS(game.current_player, seed=seed, **search_settings)
+    search_stats = SearchStats()
+    root_stats = player._search(game, simulations, search_stats)
+    return root_stats, search_stats
+
+
+###############################################################################
+#   Shared tree workers
+#
+# The shared tree attached to by this worker process
+_worker_shared_tree: SharedMCTSTree | None = None
+
+
+def _attach_shared_tree(name: str, capacity: int, locks: List[Any], allocation_lock: Any) -> None:
+    """Initializer of the worker processes: attaches to the shared tree. The locks can only reach the workers when they start."""
+    global _worker_shared_tree
+    _worker_shared_tree = SharedMCTSTree(capacity, locks, allocation_lock, name=name)
+
+
+def _shared_tree_worker(game: BaseGame, simulations: int, seed: int, search_settings: Dict[str, Any]) -> SearchStats:
+    """Runs in a worker process: grows the shared tree, rooted at the game state, and returns the search statistics."""
+    assert _worker_shared_tree is not None
+    player = PlayerMCTS(game.current_player, seed=seed, **search_settings)
+    search_stats = SearchStats()
+    player._search_array(game, simulations, search_stats, tree=_worker_shared_tree)
+    return search_stats
+
+
+def _release_shared_tree(executor: ProcessPoolExecutor, tree: SharedMCTSTree) -> None:
+    """Stops the worker processes, then frees the shared tree."""
+    executor.shutdown()
+    tree.close()
@@ -11,19 +11,25 @@ class PlayerRandom(BasePlayer):
     """
     Represents an AI player that chooses a move randomly from legal options.
     """
-    def __init__(self, player_id: PlayerID):
+    def __init__(self, player_id: PlayerID, seed: int | None = None, verbose: bool = True):
         self.player_id: PlayerID = player_id
         self.marker: PlayerMarker = player_id_to_marker(player_id)
+        self.verbose: bool = verbose # Print the moves, disabled for headless games
+        self.rnd_generator = random.Random()
+        if seed is not None:
+            self.rnd_generator.seed(seed)
 
     def get_move(self, game: BaseGame) -> Move:
         """
         Picks a random move from the list of legal moves.
         """
-        print(f"🤖 AI's Turn ({self.marker}). Thinking...")
+        if self.verbose:
+            print(f"🤖 AI's Turn ({self.marker}). Thinking...")
         legal_moves = game.get_legal_moves()
         if legal_moves:
-            ai_move = random.choice(legal_moves)
-            print(f"AI chooses move: {ai_move}")
+            ai_move = self.rnd_generator.choice(legal_moves)
+            if self.verbose:
+                print(f"AI chooses move: {ai_move}")
             return ai_move
         
         # This should ideally not be reached if is_game_over is checked first
@@ -31,4 +37,6 @@ class PlayerRandom(BasePlayer):
 
     def copy(self) -> 'PlayerRandom':
         """Create and return a copy of this player instance."""
-        return PlayerRandom(self.player_id)
+        new_player = PlayerRandom(self.player_id, verbose=self.verbose)
+        new_player.rnd_generator.setstate(self.rnd_generator.getstate())
+        return new_player
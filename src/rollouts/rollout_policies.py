@@ -0,0 +1,86 @@
+"""
+Rollout policies: how PlayerMCTS picks the moves of its playouts.
+
+The tactical and weighted policies rely on the rollout hooks of the games, `BaseGame.tactical_moves` and
+`BaseGame.move_weights`, which each game implements on its own fast representation. A game without a hook
+gets uniformly random moves instead.
+"""
+
+# stdlib imports
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, List, Type
+
+# local imports
+from src.bases.move import Move
+from src.bases.base_game import BaseGame
+
+
+###############################################################################
+#   Rollout policy interface
+#
+class RolloutPolicy(ABC):
+    """
+    Picks the moves of a playout. Policies hold no state, so one instance can be shared by several players.
+    """
+    name: str
+
+    @abstractmethod
+    def choose_move(self, game: BaseGame, legal_moves: List[Move], rnd_generator: random.Random) -> Move:
+        """Returns one of the legal moves of the game, which is not over."""
+        raise NotImplementedError
+
+
+###############################################################################
+#   Built-in policies
+#
+class RandomRolloutPolicy(RolloutPolicy):
+    """Plays uniformly random moves."""
+    name = "random"
+
+    def choose_move(self, game: BaseGame, legal_moves: List[Move], rnd_generator: random.Random) -> Move:
+        return rnd_generator.choice(legal_moves)
+
+
+class TacticalRolloutPolicy(RolloutPolicy):
+    """Takes an immediate win, else blocks an immediate loss, else plays a random move."""
+    name = "tactical"
+
+    def choose_move(self, game: BaseGame, legal_moves: List[Move], rnd_generator: random.Random) -> Move:
+        tactical_moves = game.tactical_moves()
+        return rnd_generator.choice(tactical_moves if tactical_moves else legal_moves)
+
+
+class WeightedRolloutPolicy(RolloutPolicy):
+    """Plays random moves, drawn in proportion to the move weights of the game, e.g. preferring Othello corners."""
+    name = "weighted"
+
+    def choose_move(self, game: BaseGame, legal_moves: List[Move], rnd_generator: random.Random) -> Move:
+        move_weights = game.move_weights()
+        if move_weights is None:
+            return rnd_generator.choice(legal_moves)
+        return rnd_generator.choices(legal_moves, weights=[move_weights[int(move)] for move in legal_moves])[0]
+
+
+class HeuristicRolloutPolicy(WeightedRolloutPolicy):
+    """Combines every hook the game provides: tactical moves first, then weighted moves, then random moves."""
+    name = "heuristic"
+
+    def choose_move(self, game: BaseGame, legal_moves: List[Move], rnd_generator: random.Random) -> Move:
+        tactical_moves = game.tactical_moves()
+        if tactical_moves:
+            return rnd_generator.choice(tactical_moves)
+        return super().choose_move(game, legal_moves, rnd_generator)
+
+
+ROLLOUT_POLICIES: Dict[str, Type[RolloutPolicy]] = {
+    policy_class.name: policy_class
+    for policy_class in (RandomRolloutPolicy, TacticalRolloutPolicy, WeightedRolloutPolicy, HeuristicRolloutPolicy)
+}
+
+
+def create_rollout_policy(name: str) -> RolloutPolicy:
+    """Returns a new rollout policy from its name, one of ROLLOUT_POLICIES."""
+    if name not in ROLLOUT_POLICIES:
+        raise ValueError(f"Unknown rollout policy: {name}")
+    return ROLLOUT_POLICIES[name]()
@@ -0,0 +1,63 @@
+"""
+Asyncio client of the game server, e.g. to test it or to load it with many sessions.
+"""
+
+# stdlib imports
+import asyncio
+import itertools
+import json
+from typing import Any, Dict
+
+# local imports
+from src.server.game_server import RequestError, ServerBusyError
+
+
+class GameClient:
+    """
+    A connection to a GameServer. Requests may be sent concurrently, each response being matched to its request by id.
+    A request answered with "ok": false raises RequestError, or ServerBusyError when the server asks to retry later.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._read_task = asyncio.create_task(self._read_responses())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> "GameClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        """Sends a request, and returns its response."""
+        request_id = next(self._request_ids)
+        response_future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = response_future
+        self._writer.write(json.dumps({"op": op, "id": request_id, **fields}).encode() + b"\n")
+        try:
+            await self._writer.drain()
+            response = await response_future
+        finally:
+            self._pending.pop(request_id, None)
+        if not response["ok"]:
+            raise (ServerBusyError if response.get("busy") else RequestError)(response["error"])
+        return response
+
+    async def _read_responses(self) -> None:
+        """Resolves the pending requests with their responses, until the connection is closed."""
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                response_future = self._pending.get(response.get("id"))
+                if response_future is not None and not response_future.done():
+                    response_future.set_result(response)
+        finally:
+            for response_future in self._pending.values():
+                if not response_future.done():
+                    response_future.set_exception(ConnectionError("The connection to the game server was closed."))
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._read_task.cancel()
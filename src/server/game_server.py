@@ -0,0 +1,404 @@
+"""
+Asyncio game server: hosts many concurrent game sessions over TCP, and searches the AI moves in a bounded pool of processes.
+
+The protocol is JSON lines: each request and each response is one JSON object on its own line. A request has an "op"
+and an optional "id", which is echoed in its response. Every response has "ok", and an "error" message when "ok" is false.
+
+    {"op": "new_game", "game": "connect4", "ai": "mcts:c_param=1.0"}  -> {"session": 1, "state": {...}}
+    {"op": "move", "session": 1, "move": 3}                          -> {"state": {...}}
+    {"op": "ai_move", "session": 1, "time_budget_ms": 500}           -> {"move": 2, "stats": {...}, "state": {...}}
+    {"op": "state", "session": 1}                                    -> {"state": {...}}
+    {"op": "cancel", "session": 1}                                   -> {"cancelled": true}
+    {"op": "close", "session": 1}                                    -> {}
+    {"op": "status"}                                                 -> {"sessions": 12, "searches_running": 4, ...}
+
+An MCTS AI searches each move until the time budget of its request, rather than for a fixed number of simulations.
+Its spec may only set c_param, rave_k, rollout_policy, transposition_table_size and time_budget_ms, the default
+time budget of its moves, each within the limits of the server.
+The requests of a connection are handled concurrently, so that a pending "ai_move" can be cancelled, and the sessions
+of a connection are closed with it, cancelling their searches. A cancelled search only stops being awaited: its worker
+process goes on searching until its time budget is spent, at most max_time_budget_ms, before taking the next search.
+"""
+
+# stdlib imports
+import asyncio
+import itertools
+import json
+import random
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Set, Tuple, TypeGuard
+
+# local imports
+from src.bases.move import Move
+from src.bases.base_game import BaseGame
+from src.players.player_mtcs import PlayerMCTS
+from src.rollouts.rollout_policies import ROLLOUT_POLICIES
+from src.games.game_registry import GAME_FACTORIES
+from src.arena.arena import PlayerSpec, parse_player_spec
+
+
+###############################################################################
+#   Errors
+#
+class RequestError(Exception):
+    """A request which cannot be served, e.g. an illegal move. Its message is sent back to the client."""
+
+
+class ServerBusyError(RequestError):
+    """Too many AI moves are waiting for a worker: the client should retry later."""
+
+
+###############################################################################
+#   Configuration
+#
+class ServerConfig(NamedTuple):
+    """Limits of a GameServer."""
+    processes: int = 1
+    """number of worker processes searching the AI moves"""
+    max_queued_searches: int = 64
+    """AI moves waiting for a worker beyond which new ones are rejected as busy"""
+    default_time_budget_ms: float = 1000.0
+    """time budget of an AI move whose request sets none"""
+    max_time_budget_ms: float = 10000.0
+    """upper bound of the time budget of an AI move"""
+    max_requests_per_connection: int = 16
+    """requests of a connection handled at once, after which the connection is no longer read"""
+    default_ai: str = "mcts"
+    """player spec of the AI of a new game whose request sets none, as parsed by parse_player_spec"""
+    max_transposition_table_size: int = 200000
+    """upper bound of the transposition table size an AI may ask for"""
+
+
+###############################################################################
+#   Search pool
+#
+def _search_move(game: BaseGame, ai_spec: PlayerSpec, seed: int, time_budget_ms: float) -> Tuple[int, Dict[str, Any] | None]:
+    """Runs in a worker process: returns the move of the AI for the player to move, and its search statistics if it is an MCTS player."""
+    options = {**ai_spec.options, "time_budget_ms": time_budget_ms} if ai_spec.kind == "mcts" else ai_spec.options
+    player = PlayerSpec(ai_spec.kind, options).create(game.current_player, seed)
+    move = player.get_move(game)
+    stats = player.last_stats.to_dict() if isinstance(player, PlayerMCTS) and player.last_stats is not None else None
+    return int(move), stats
+
+
+class SearchPool:
+    """
+    A pool of processes searching the AI moves, with at most one search per process at a time.
+
+    A search waits in the event loop until a process is free, and its time budget covers that wait: the process searches
+    for the rest of the budget. A search which cannot get a process within its budget, or which would make too many
+    searches wait, fails with ServerBusyError. A cancelled search frees its process only once the process is done with it.
+    """
+    def __init__(self, processes: int, max_queued_searches: int):
+        self.processes: int = processes
+        self.max_queued_searches: int = max_queued_searches
+        self.searches_running: int = 0
+        self.searches_queued: int = 0
+        self._executor = ProcessPoolExecutor(max_workers=processes)
+        self._free_processes = asyncio.Semaphore(processes)
+
+    async def search(self, game: BaseGame, ai_spec: PlayerSpec, seed: int, time_budget_ms: float) -> Tuple[int, Dict[str, Any] | None]:
+        """Returns the move of the AI and its search statistics, searched within the time budget."""
+        if self.searches_queued >= self.max_queued_searches:
+            raise ServerBusyError("The server is busy, retry later.")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + time_budget_ms / 1000.0
+        self.searches_queued += 1
+        try:
+            await asyncio.wait_for(self._free_processes.acquire(), timeout=time_budget_ms / 1000.0)
+        except asyncio.TimeoutError:
+            raise ServerBusyError("No worker was free within the time budget, retry later.") from None
+        finally:
+            self.searches_queued -= 1
+
+        self.searches_running += 1
+        remaining_budget_ms = max(1.0, (deadline - loop.time()) * 1000.0)
+        future = self._executor.submit(_search_move, game, ai_spec, seed, remaining_budget_ms)
+
+        def release_process() -> None:
+            self.searches_running -= 1
+            self._free_processes.release()
+
+        def on_search_done(_: Future) -> None:
+            # Called from a thread of the executor, possibly after the server stopped
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(release_process)
+
+        # The process is released when the search ends, even if the awaiting request was cancelled meanwhile
+        future.add_done_callback(on_search_done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes, without waiting for the running searches."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+###############################################################################
+#   Game sessions
+#
+class GameSession:
+    """A game between a client and an AI. The AI plays whichever side the client asks it to move."""
+    def __init__(self, session_id: int, game_name: str, ai_spec: PlayerSpec, seed: int):
+        self.session_id: int = session_id
+        self.game_name: str = game_name
+        self.game: BaseGame = GAME_FACTORIES[game_name]()
+        self.ai_spec: PlayerSpec = ai_spec
+        self.rnd_generator = random.Random(seed) # Seeds the AI of each move
+        self.search: asyncio.Future | None = None # The pending AI move, if any
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the state of the game as a JSON-serialisable dict. The board can be rebuilt with from_state_key."""
+        game = self.game
+        winner = game.get_winner()
+        return {
+            "game": self.game_name,
+            "state_key": game.state_key(),
+            "board_size": list(game.board_size()),
+            "current_player": game.current_player,
+            "ply": game.ply,
+            "legal_moves": [int(move) for move in game.get_legal_moves()],
+            "game_over": game.is_game_over(),
+            "winner": winner,
+        }
+
+    def cancel_search(self) -> bool:
+        """
+        Cancels the pending AI move, and returns whether there was one. The worker process searching it is not interrupted,
+        and stays busy until the time budget of the search is spent.
+        """
+        if self.search is None or self.search.done():
+            return False
+        self.search.cancel()
+        return True
+
+
+###############################################################################
+#   Game server
+#
+class GameServer:
+    """Serves game sessions over TCP. See the module docstring for the protocol."""
+    def __init__(self, config: ServerConfig = ServerConfig(), seed: int | None = None):
+        self.config: ServerConfig = config
+        self.rnd_generator = random.Random(seed)
+        self.session_count: int = 0
+        self._session_ids = itertools.count(1)
+        self._search_pool: SearchPool | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._operations: Dict[str, Callable[[Dict[str, Any], Dict[int, GameSession]], Awaitable[Dict[str, Any]]]] = {
+            "new_game": self._new_game,
+            "move": self._move,
+            "ai_move": self._ai_move,
+            "state": self._state,
+            "cancel": self._cancel,
+            "close": self._close,
+            "status": self._status,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+        """Starts the worker processes and listens for connections, port 0 picking a free port."""
+        self._search_pool = SearchPool(self.config.processes, self.config.max_queued_searches)
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """Serves connections until cancelled, then stops the worker processes."""
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stops listening and stops the worker processes."""
+        if self._server is not None:
+            self._server.close()
+        if self._search_pool is not None:
+            self._search_pool.shutdown()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Reads the requests of a connection and handles them concurrently, up to max_requests_per_connection at once."""
+        sessions: Dict[int, GameSession] = {}
+        write_lock = asyncio.Lock()
+        # Not reading the requests beyond the limit leaves them in the socket, which eventually blocks the client
+        requests_in_flight = asyncio.Semaphore(self.config.max_requests_per_connection)
+        request_tasks: Set[asyncio.Task] = set()
+
+        def finish_request(task: asyncio.Task) -> None:
+            request_tasks.discard(task)
+            requests_in_flight.release()
+
+        try:
+            while True:
+                await requests_in_flight.acquire()
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._handle_request(line, sessions, writer, write_lock))
+                request_tasks.add(task)
+                task.add_done_callback(finish_request)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass  # The client disconnected, or sent an oversized line
+        except asyncio.CancelledError:
+            pass  # The server is shutting down
+        finally:
+            for task in list(request_tasks):
+                task.cancel()
+            for session in sessions.values():
+                session.cancel_search()
+            self.session_count -= len(sessions)
+            writer.close()
+
+    async def _handle_request(self, line: bytes, sessions: Dict[int, GameSession], writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        """Handles one request line, and writes its response."""
+        request: Dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("A request must be a JSON object.")
+            operation = self._operations.get(request.get("op", ""))
+            if operation is None:
+                raise RequestError(f"Unknown op: {request.get('op')}")
+            response = {"ok": True, **await operation(request, sessions)}
+        except ServerBusyError as error:
+            response = {"ok": False, "error": str(error), "busy": True}
+        except RequestError as error:
+            response = {"ok": False, "error": str(error)}
+        except json.JSONDecodeError as error:
+            response = {"ok": False, "error": f"Invalid JSON: {error}"}
+        except Exception as error:
+            response = {"ok": False, "error": f"Internal error: {error!r}"}
+        if "id" in request:
+            response["id"] = request["id"]
+
+        async with write_lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass  # The client is gone, the connection handler cleans up
+
+    def _check_ai_spec(self, ai_spec: PlayerSpec) -> None:
+        """
+        Raises ValueError unless every option of the AI is one a client may set, within the server limits.
+        Any other option could let a client pin the workers or reach the server files, e.g. rollouts_per_leaf,
+        threads, playout_backend, opening_book or stats_callback. The time_budget_ms of an MCTS AI is the default
+        time budget of its moves.
+        """
+        if ai_spec.kind != "mcts":
+            if ai_spec.options:
+                raise ValueError(f"the {ai_spec.kind} AI takes no options.")
+            return
+        max_time_budget_ms = self.config.max_time_budget_ms
+        max_transposition_table_size = self.config.max_transposition_table_size
+        # Maps each allowed option to a check of its value, and a description of the values it accepts
+        option_checks: Dict[str, Tuple[Callable[[Any], bool], str]] = {
+            "c_param": (lambda value: _is_number(value) and 0 < value <= 10, "a number in (0, 10]"),
+            "rave_k": (lambda value: _is_number(value) and 0 <= value <= 1e6, "a number in [0, 1e6]"),
+            "rollout_policy": (lambda value: value in ROLLOUT_POLICIES, f"one of {', '.join(ROLLOUT_POLICIES)}"),
+            "transposition_table_size": (
+                lambda value: _is_integer(value) and 0 <= value <= max_transposition_table_size,
+                f"an integer in [0, {max_transposition_table_size}]",
+            ),
+            "time_budget_ms": (lambda value: _is_number(value) and 0 < value <= max_time_budget_ms, f"a number in (0, {max_time_budget_ms:g}]"),
+        }
+        for name, value in ai_spec.options.items():
+            if name not in option_checks:
+                raise ValueError(f"unsupported option {name}, the MCTS AI accepts {', '.join(option_checks)}.")
+            check, accepted_values = option_checks[name]
+            if not check(value):
+                raise ValueError(f"{name} must be {accepted_values}.")
+
+    @staticmethod
+    def _get_session(request: Dict[str, Any], sessions: Dict[int, GameSession]) -> GameSession:
+        session_id = request.get("session")
+        session = sessions.get(session_id) if _is_integer(session_id) else None
+        if session is None:
+            raise RequestError(f"Unknown session: {request.get('session')}")
+        return session
+
+    async def _new_game(self, request: Dict[str, Any], sessions: Dict[int, GameSession]) -> Dict[str, Any]:
+        game_name = request.get("game", "connect4")
+        if game_name not in GAME_FACTORIES:
+            raise RequestError(f"Unknown game: {game_name}")
+        try:
+            ai_spec = parse_player_spec(request.get("ai") or self.config.default_ai)
+            self._check_ai_spec(ai_spec)
+        except ValueError as error:
+            raise RequestError(f"Invalid AI: {error}") from None
+
+        session = GameSession(next(self._session_ids), game_name, ai_spec, self.rnd_generator.getrandbits(64))
+        sessions[session.session_id] = session
+        self.session_count += 1
+        return {"session": session.session_id, "state": session.to_dict()}
+
+    async def _move(self, request: Dict[str, Any], sessions: Dict[int, GameSession]) -> Dict[str, Any]:
+        session = self._get_session(request, sessions)
+        if session.search is not None:
+            raise RequestError("An AI move is being searched: wait for it or cancel it first.")
+        if session.game.is_game_over():
+            raise RequestError("The game is over.")
+        move = request.get("move")
+        if not _is_integer(move) or move not in [int(legal_move) for legal_move in session.game.get_legal_moves()]:
+            raise RequestError(f"Illegal move: {move}")
+        session.game.apply_move(Move.of(move))
+        return {"state": session.to_dict()}
+
+    async def _ai_move(self, request: Dict[str, Any], sessions: Dict[int, GameSession]) -> Dict[str, Any]:
+        assert self._search_pool is not None
+        session = self._get_session(request, sessions)
+        if session.search is not None:
+            raise RequestError("An AI move is already being searched for this session.")
+        if session.game.is_game_over():
+            raise RequestError("The game is over.")
+        time_budget_ms = request.get("time_budget_ms", session.ai_spec.options.get("time_budget_ms", self.config.default_time_budget_ms))
+        if not _is_number(time_budget_ms) or time_budget_ms <= 0:
+            raise RequestError(f"Invalid time budget: {time_budget_ms}")
+        time_budget_ms = min(float(time_budget_ms), self.config.max_time_budget_ms)
+
+        search = asyncio.ensure_future(self._search_pool.search(session.game.copy(), session.ai_spec, session.rnd_generator.getrandbits(64), time_budget_ms))
+        session.search = search
+        try:
+            # Waiting does not propagate the cancellation of the search by a "cancel" request
+            await asyncio.wait({search})
+        finally:
+            session.search = None
+            # Cancels the search if this request was cancelled, e.g. because the client disconnected
+            search.cancel()
+        if search.cancelled():
+            raise RequestError("The AI move was cancelled.")
+
+        move, stats = search.result()
+        session.game.apply_move(Move.of(move))
+        return {"move": move, "stats": stats, "state": session.to_dict()}
+
+    async def _state(self, request: Dict[str, Any], sessions: Dict[int, GameSession]) -> Dict[str, Any]:
+        return {"state": self._get_session(request, sessions).to_dict()}
+
+    async def _cancel(self, request: Dict[str, Any], sessions: Dict[int, GameSession]) -> Dict[str, Any]:
+        return {"cancelled": self._get_session(request, sessions).cancel_search()}
+
+    async def _close(self, request: Dict[str, Any], sessions: Dict[int, GameSession]) -> Dict[str, Any]:
+        session = self._get_session(request, sessions)
+        session.cancel_search()
+        del sessions[session.session_id]
+        self.session_count -= 1
+        return {}
+
+    async def _status(self, request: Dict[str, Any], sessions: Dict[int, GameSession]) -> Dict[str, Any]:
+        assert self._search_pool is not None
+        return {
+            "sessions": self.session_count,
+            "processes": self._search_pool.processes,
+            "searches_running": self._search_pool.searches_running,
+            "searches_queued": self._search_pool.searches_queued,
+        }
+
+
+def _is_number(value: Any) -> bool:
+    # JSON true and false are decoded as bool, a subclass of int
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value: Any) -> TypeGuard[int]:
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -0,0 +1,27 @@
+# stdlib imports
+import multiprocessing
+import time
+
+# local imports
+from src.arena.arena import ArenaGameResult, parse_player_spec, run_arena
+from src.arena.elo import SPRT, MatchTally
+
+
+def test_sprt_verdict_abandons_the_games_in_flight():
+    """Once the test has a verdict, run_arena returns at once and leaves no worker process playing the next game."""
+    # Loose bounds, so that the first game decides; each Connect4 game takes several seconds at 500 ms per AI move
+    sprt = SPRT(elo0=0.0, elo1=400.0, alpha=0.45, beta=0.45)
+    results = []
+    verdict_times = []
+
+    def on_result(result: ArenaGameResult, tally: MatchTally) -> None:
+        results.append(result)
+        verdict_times.append(time.perf_counter())
+
+    summary = run_arena("connect4", parse_player_spec("mcts:time_budget_ms=500"), parse_player_spec("random"), 10, processes=1, seed=1, sprt=sprt, on_result=on_result)
+    returned_time = time.perf_counter()
+
+    assert summary.verdict is not None
+    assert summary.tally.games == 1 and [result.game_index for result in results] == [0]
+    assert returned_time - verdict_times[0] < 1.0, "the second game, started when the first one ended, should not be waited for"
+    assert multiprocessing.active_children() == []
@@ -0,0 +1,170 @@
+# stdlib imports
+import random
+from typing import List, Set, Tuple
+
+# local imports
+from src.bases.types import PlayerID
+from src.bases.move import Move
+from src.games.game_connect4 import GameConnect4, _connect4_masks
+
+
+def connect4_position(rows: List[str], current_player: int = 1) -> GameConnect4:
+    """Builds a position from rows of 'X', 'O' and '.' squares, top row first."""
+    row_count, col_count = len(rows), len(rows[0])
+    bitboard_x = bitboard_o = 0
+    for row_index, row in enumerate(rows):
+        row_from_bottom = row_count - 1 - row_index
+        for col, cell in enumerate(row):
+            bit = 1 << (col * (row_count + 1) + row_from_bottom)
+            if cell == "X":
+                bitboard_x |= bit
+            elif cell == "O":
+                bitboard_o |= bit
+    state_key = GameConnect4._pack_state_key(bitboard_x, bitboard_o, col_count * (row_count + 1), PlayerID(current_player))
+    return GameConnect4.from_state_key(state_key, row_count, col_count)
+
+
+def play(columns: List[int], game: GameConnect4 | None = None) -> GameConnect4:
+    game = game or GameConnect4()
+    for col in columns:
+        assert not game.is_game_over()
+        game = game.make_move(Move.of(col))
+    return game
+
+
+# Squares, as (row from bottom, col), of the lines of 4 through the square in each direction.
+# Vertically only the line ending on top of the square counts, as discs can't be under an empty square
+def lines_through(row: int, col: int, rows: int, cols: int) -> List[List[Tuple[int, int]]]:
+    lines = [[(row - offset, col) for offset in range(4)]]
+    for dr, dc in ((0, 1), (1, 1), (1, -1)):
+        for start in range(-3, 1):
+            lines.append([(row + (start + offset) * dr, col + (start + offset) * dc) for offset in range(4)])
+    return [line for line in lines if all(0 <= r < rows and 0 <= c < cols for r, c in line)]
+
+
+def reference_winner(game: GameConnect4) -> int | None:
+    board = game.board
+    cell = lambda r, c: board[(game.rows - 1 - r) * game.cols + c]
+    for row in range(game.rows):
+        for col in range(game.cols):
+            for line in lines_through(row, col, game.rows, game.cols):
+                values = {cell(r, c) for r, c in line}
+                if len(values) == 1 and values != {0}:
+                    return values.pop()
+    return 0 if game.empty_count == 0 else None
+
+
+def reference_winning_squares(game: GameConnect4, player: int) -> Set[Tuple[int, int]]:
+    board = game.board
+    cell = lambda r, c: board[(game.rows - 1 - r) * game.cols + c]
+    return {
+        (row, col)
+        for row in range(game.rows)
+        for col in range(game.cols)
+        if any(all(cell(r, c) == player for r, c in line if (r, c) != (row, col)) for line in lines_through(row, col, game.rows, game.cols))
+    }
+
+
+def test_horizontal_wins_at_both_edges():
+    assert play([0, 0, 1, 1, 2, 2, 3]).get_winner() == 1
+    assert play([6, 6, 5, 5, 4, 4, 3]).get_winner() == 1
+    # O completes a line in the top row
+    game = connect4_position([
+        ".OOO...",
+        ".OXXX..",
+        ".OOOX..",
+        ".XXXO..",
+        ".XXXO..",
+        ".OOXX..",
+    ], current_player=-1)
+    assert game.get_winner() is None
+    assert play([4], game).get_winner() == -1
+
+
+def test_vertical_win_reaching_the_top_row():
+    game = connect4_position([
+        ".......",
+        "......X",
+        "......X",
+        "......X",
+        "......O",
+        "O.....O",
+    ])
+    assert game.get_winner() is None
+    assert play([6], game).get_winner() == 1
+
+
+def test_diagonal_wins():
+    # Rising from the bottom left corner
+    game = connect4_position([
+        ".......",
+        ".......",
+        ".......",
+        "..XO...",
+        ".XOX...",
+        "XOOX..O",
+    ])
+    assert game.get_winner() is None
+    assert play([3], game).get_winner() == 1
+    # Falling from the top row to the right edge
+    game = connect4_position([
+        ".......",
+        "...OX..",
+        "...XXX.",
+        "...OOXX",
+        "...XOOO",
+        "O..XOXO",
+    ])
+    assert game.get_winner() is None
+    assert play([3], game).get_winner() == 1
+
+
+def test_lines_do_not_carry_over_to_the_next_column():
+    # The top 3 discs of a column and the bottom disc of the next one are consecutive bits but for the sentinel
+    game = connect4_position([
+        "X......",
+        "X......",
+        "X......",
+        "O......",
+        "O......",
+        "OX.....",
+    ], current_player=-1)
+    assert game.get_winner() is None
+
+
+def test_full_board_without_line_is_a_draw():
+    game = connect4_position([
+        "OOXXOOX",
+        "XXOOXXO",
+        "OOXXOOX",
+        "XXOOXXO",
+        "OOXXOOX",
+        "XXOOXXO",
+    ])
+    assert game.empty_count == 0
+    assert game.get_legal_moves() == []
+    assert game.get_winner() == 0
+
+
+def test_winning_squares_include_gaps_inside_a_line():
+    # X to move wins in the gap of X X . X, and O would block it
+    game = play([0, 0, 1, 1, 3, 3])
+    assert [int(move) for move in game.tactical_moves()] == [2]
+    game = play([6], game)
+    assert [int(move) for move in game.tactical_moves()] == [2]
+
+
+def test_winner_and_winning_squares_match_a_reference_over_random_games():
+    rnd_generator = random.Random(11)
+    for _ in range(30):
+        game = GameConnect4()
+        while True:
+            assert game.get_winner() == reference_winner(game)
+            _, board_mask = _connect4_masks(game.rows, game.cols)
+            for player, bitboard in ((1, game.bitboard_x), (-1, game.bitboard_o)):
+                winning_squares = game._winning_squares(bitboard) & board_mask
+                squares = {(bit_index % (game.rows + 1), bit_index // (game.rows + 1)) for bit_index in range(winning_squares.bit_length()) if winning_squares >> bit_index & 1}
+                assert squares == reference_winning_squares(game, player)
+            if game.is_game_over():
+                break
+            game = game.make_move(rnd_generator.choice(game.get_legal_moves()))
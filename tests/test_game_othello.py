@@ -0,0 +1,181 @@
+# stdlib imports
+import random
+from typing import List, Set
+
+# local imports
+from src.bases.types import PlayerID
+from src.bases.move import Move
+from src.games.game_othello import GameOthello
+
+
+def othello_position(rows: List[str], current_player: int = 1) -> GameOthello:
+    """Builds a position from rows of 'X', 'O' and '.' squares."""
+    size = len(rows)
+    bitboard_x = bitboard_o = 0
+    for square, cell in enumerate("".join(rows)):
+        if cell == "X":
+            bitboard_x |= 1 << square
+        elif cell == "O":
+            bitboard_o |= 1 << square
+    state_key = GameOthello._pack_state_key(bitboard_x, bitboard_o, size * size, PlayerID(current_player))
+    return GameOthello.from_state_key(state_key, size)
+
+
+def reference_flips(game: GameOthello, square: int) -> Set[int]:
+    """Squares flipped by the player to move playing at `square`, walking the board square by square."""
+    board, size, player = game.board, game.size, game.current_player
+    if board[square] != 0:
+        return set()
+    row, col = divmod(square, size)
+    flips: Set[int] = set()
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            line: List[int] = []
+            r, c = row + dr, col + dc
+            while (dr or dc) and 0 <= r < size and 0 <= c < size and board[r * size + c] == -player:
+                line.append(r * size + c)
+                r, c = r + dr, c + dc
+            if line and 0 <= r < size and 0 <= c < size and board[r * size + c] == player:
+                flips.update(line)
+    return flips
+
+
+def reference_legal_moves(game: GameOthello) -> List[int]:
+    return [square for square in range(game.size * game.size) if reference_flips(game, square)]
+
+
+def test_initial_legal_moves():
+    assert [int(move) for move in GameOthello().get_legal_moves()] == [19, 26, 37, 44]
+    assert [int(move) for move in GameOthello(6).get_legal_moves()] == [8, 13, 22, 27]
+
+
+def test_lines_do_not_wrap_around_the_board_edges():
+    # An X disc at the end of a row and an O disc at the start of the next one are not on a line
+    game = othello_position([
+        ".......X",
+        "O.......",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+    ])
+    assert 9 not in [int(move) for move in game.get_legal_moves()]
+
+
+def test_move_flips_every_bracketed_line():
+    game = othello_position([
+        "X..X..X.",
+        ".O.O.O..",
+        "..OOO...",
+        "XOO.OOX.",
+        "..OOO...",
+        ".O.O.O..",
+        "X..X..X.",
+        ".......O",
+    ])
+    assert reference_flips(game, 27) == {9, 11, 13, 18, 19, 20, 25, 26, 28, 29, 34, 35, 36, 41, 43, 45}
+    game.apply_move(Move.of(27))
+    # Every O disc is flipped but the one in the corner, which is not on a line of the move
+    assert game.bitboard_o == 1 << 63
+    assert game.bitboard_x.bit_count() == 8 + 1 + 16
+
+
+def test_legal_moves_and_flips_match_a_reference_over_random_games():
+    rnd_generator = random.Random(7)
+    for size in (6, 8):
+        for _ in range(10):
+            game = GameOthello(size)
+            while not game.is_game_over():
+                assert [int(move) for move in game.get_legal_moves()] == reference_legal_moves(game)
+                move = rnd_generator.choice(game.get_legal_moves())
+                expected_flips = reference_flips(game, int(move))
+                player = game.current_player
+                board = game.board
+                game = game.make_move(move)
+                changed = {square for square, (before, after) in enumerate(zip(board, game.board)) if before != after}
+                assert changed == expected_flips | {int(move)}
+                assert all(game.board[square] == player for square in changed)
+                assert game.zobrist_hash == game._compute_zobrist_hash()
+
+
+def test_player_without_moves_passes():
+    game = othello_position([
+        "XO......",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        "......OX",
+    ])
+    game.apply_move(Move.of(2))
+    # O has no legal move, so X plays again
+    assert game.current_player == 1
+    assert [int(move) for move in game.get_legal_moves()] == [61]
+    assert not game.is_game_over()
+    assert game.zobrist_hash == game._compute_zobrist_hash()
+    assert game == othello_position([
+        "XXX.....",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        "......OX",
+    ], current_player=1)
+
+
+def test_game_ends_when_neither_player_can_move():
+    game = othello_position([
+        "X......X",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        ".......O",
+    ])
+    assert game.empty_count == 61
+    assert game.get_legal_moves() == []
+    assert game.is_game_over()
+    assert game.get_winner() == 1
+
+    game = othello_position([
+        "XO......",
+        "........",
+        "........",
+        "........",
+        "........",
+        "........",
+        ".......O",
+        "......OO",
+    ])
+    # X takes the only disc it can reach, after which neither side can move: 3 discs each, a draw
+    game.apply_move(Move.of(2))
+    assert game.is_game_over()
+    assert game.get_winner() == 0
+
+
+def test_undo_move_restores_the_position():
+    rnd_generator = random.Random(3)
+    game = GameOthello()
+    history = []
+    while not game.is_game_over():
+        history.append((game.state_key(), game.zobrist_hash, game.empty_count, game.current_player, game.last_move, list(game.get_legal_moves())))
+        game.apply_move(rnd_generator.choice(game.get_legal_moves()))
+    assert any(after[3] == before[3] for before, after in zip(history, history[1:])), "the game should contain a pass"
+    while history:
+        game.undo_move()
+        state_key, zobrist_hash, empty_count, current_player, last_move, legal_moves = history.pop()
+        assert game.state_key() == state_key
+        assert game.zobrist_hash == zobrist_hash
+        assert game.empty_count == empty_count
+        assert game.current_player == current_player
+        assert game.last_move == last_move
+        assert game.get_legal_moves() == legal_moves
+        assert not game.is_game_over()
@@ -0,0 +1,38 @@
+# stdlib imports
+import asyncio
+
+# pip imports
+import pytest
+
+# local imports
+from src.server.game_client import GameClient
+from src.server.game_server import GameServer, RequestError, ServerConfig
+
+
+async def check_booleans_are_rejected() -> None:
+    server = GameServer(ServerConfig(processes=1, default_ai="random"), seed=1)
+    listener = await server.start(port=0)
+    assert isinstance(listener, asyncio.Server)
+    client = await GameClient.connect(port=listener.sockets[0].getsockname()[1])
+    try:
+        response = await client.request("new_game", game="tictactoe")
+        session = response["session"]
+        # JSON true and false decode to bool, which Python counts as the integers 1 and 0
+        with pytest.raises(RequestError, match="Unknown session"):
+            await client.request("state", session=True)
+        with pytest.raises(RequestError, match="Illegal move"):
+            await client.request("move", session=session, move=True)
+        with pytest.raises(RequestError, match="Invalid time budget"):
+            await client.request("ai_move", session=session, time_budget_ms=True)
+        with pytest.raises(RequestError, match="c_param"):
+            await client.request("new_game", game="tictactoe", ai="mcts:c_param=True")
+        with pytest.raises(RequestError, match="transposition_table_size"):
+            await client.request("new_game", game="tictactoe", ai="mcts:transposition_table_size=True")
+        assert (await client.request("move", session=session, move=1))["state"]["ply"] == 1
+    finally:
+        await client.close()
+        server.close()
+
+
+def test_booleans_are_rejected_as_numbers():
+    asyncio.run(check_booleans_are_rejected())
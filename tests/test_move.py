@@ -0,0 +1,20 @@
+# stdlib imports
+import pickle
+
+# pip imports
+import pytest
+
+# local imports
+from src.bases.move import Move, move_table
+
+
+def test_moves_are_interned():
+    assert Move.of(5) is Move.of(5)
+    assert move_table(9)[5] is Move.of(5)
+    assert pickle.loads(pickle.dumps(Move.of(70))) is Move.of(70)
+
+
+def test_negative_move_index_is_rejected():
+    Move.of(3)
+    with pytest.raises(ValueError):
+        Move.of(-1)
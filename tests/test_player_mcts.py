@@ -0,0 +1,130 @@
+# stdlib imports
+from typing import List
+
+# local imports
+from src.bases.types import GameResult, PlayerID
+from src.bases.move import Move
+from src.book.opening_book import OpeningBook
+from src.games.game_connect4 import GameConnect4
+from src.games.game_tictactoe import GameTicTacToe
+from src.players.player_mtcs import MCTSNode, PlayerMCTS, SearchStats
+
+
+def tictactoe_after(moves: List[int]) -> GameTicTacToe:
+    game = GameTicTacToe()
+    for move in moves:
+        game = game.make_move(Move.of(move))
+    return game
+
+
+def test_rave_credits_the_moves_of_the_path_with_a_transposition_table():
+    """With a transposition table, a node reached through another parent must be credited the move of the current path."""
+    game = GameConnect4()
+    player = PlayerMCTS(PlayerID(game.current_player), simulations=2000, seed=1, rave_k=500.0, transposition_table_size=100000)
+    checked_paths = []
+    shared_edges = 0
+    backpropagate_amaf = PlayerMCTS._backpropagate_amaf
+
+    def checked_backpropagate_amaf(path, path_moves, playouts):
+        nonlocal shared_edges
+        assert len(path_moves) == len(path) - 1
+        for parent, child, move in zip(path, path[1:], path_moves):
+            assert parent.children[move] is child
+            shared_edges += child.parent_move != move
+        backpropagate_amaf(path, path_moves, playouts)
+        # The player to move at the root played the first move of the path, which counts as played first
+        if path_moves:
+            assert path_moves[0] in (path[0].amaf_visits or {})
+        checked_paths.append(path)
+
+    player._backpropagate_amaf = checked_backpropagate_amaf
+    root = MCTSNode(game)
+    player._search_tree(root, player.simulations, stats=SearchStats())
+
+    assert checked_paths
+    assert shared_edges > 0, "the search should reach transposed nodes through another parent"
+
+
+def test_solver_plays_a_mate_in_one():
+    # X . X / O O . / . . . with X to move: 1 wins at once, while O threatens 5
+    game = tictactoe_after([0, 3, 2, 4])
+    player = PlayerMCTS(PlayerID(game.current_player), simulations=2000, seed=1)
+    assert int(player.get_move(game)) == 1
+    assert player.last_stats is not None
+    assert player.last_stats.proven_moves[1] == 1
+    # The root is proven as soon as the winning child is expanded, which ends the search
+    assert player.last_stats.simulations < player.simulations
+
+
+def test_solver_falls_back_to_the_most_visited_move_when_every_move_loses():
+    # X has three open lines (0-1-2, 2-4-6 and 0-4-8) against O to move, who loses whatever it plays
+    game = tictactoe_after([0, 3, 4, 5, 2])
+    player = PlayerMCTS(PlayerID(game.current_player), simulations=2000, seed=1)
+    move = int(player.get_move(game))
+    stats = player.last_stats
+    assert stats is not None
+    assert set(stats.proven_moves) == {int(legal_move) for legal_move in game.get_legal_moves()}
+    assert set(stats.proven_moves.values()) == {-1}
+    assert move == max(stats.root_children, key=lambda root_move: stats.root_children[root_move][0])
+
+    root_stats = {6: (10, 1.0), 7: (30, 2.0), 8: (20, 15.0)}
+    assert int(player._best_move(root_stats, {6: -1, 7: -1, 8: -1})) == 7
+    # A move proven to lose is avoided when another is not, and a proven win is played whatever its visits
+    assert int(player._best_move(root_stats, {7: -1})) == 8
+    assert int(player._best_move(root_stats, {6: 1, 7: -1})) == 6
+
+
+def test_selection_skips_proven_children():
+    root = MCTSNode(GameTicTacToe())
+    root.visits = 30
+    for move in list(root.untried_moves):
+        root.children[move] = MCTSNode(root.game_state.make_move(Move.of(move)), root, move)
+        root.children[move].visits = 3
+        root.children[move].wins = 1.0
+    root.untried_moves = []
+    # The best child by far, but proven: searching it again cannot change its result
+    root.children[4].wins = 3.0
+    root.children[4].proven = GameResult(0)
+    best_move_node = root.best_uct_child()
+    assert best_move_node is not None and best_move_node[0] != 4
+    for child in root.children.values():
+        child.proven = GameResult(0)
+    assert root.best_uct_child() is None
+    # Every child being proven, the root is proven with the best of their results
+    assert root.update_proven() and root.proven == 0
+
+
+def test_reused_tree_merges_only_the_visits_of_the_search_into_the_book(tmp_path):
+    book_path = str(tmp_path / "book.sqlite")
+    game = GameConnect4()
+    player = PlayerMCTS(PlayerID(1), simulations=300, seed=1, reuse_tree=True, opening_book=book_path)
+    game = game.make_move(player.get_move(game)).make_move(Move.of(3))
+    # The kept tree already holds visits of the position, from the search of the previous move
+    player.get_move(game)
+    player.close()
+
+    book = OpeningBook(book_path)
+    book_entry = book.lookup(game)
+    book.close()
+    assert book_entry is not None and book_entry.simulations == 300
+    assert sum(visits for visits, _ in book_entry.move_stats.values()) == 300
+
+
+def test_tree_size_counts_the_kept_tree():
+    game = GameConnect4()
+    player = PlayerMCTS(PlayerID(1), simulations=300, seed=1, reuse_tree=True)
+    searched_roots = []
+    find_kept_root = player._find_kept_root
+
+    def recorded_find_kept_root(game):
+        root = find_kept_root(game)
+        searched_roots.append(root)
+        return root
+
+    player._find_kept_root = recorded_find_kept_root
+    for _ in range(2):
+        game = game.make_move(player.get_move(game)).make_move(Move.of(3))
+    stats, kept_root = player.last_stats, searched_roots[-1]
+    assert stats is not None and kept_root is not None
+    # The tree searched by the second move is the kept subtree, grown by 300 simulations
+    assert stats.tree_size == kept_root.count_nodes() > 301
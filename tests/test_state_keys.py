@@ -0,0 +1,100 @@
+# stdlib imports
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+# local imports
+from src.bases.base_game import BaseGame
+from src.bases.move import Move
+from src.games.game_connect4 import GameConnect4
+from src.games.game_othello import GameOthello
+from src.games.game_tictactoe import GameTicTacToe
+
+
+def random_positions(game: BaseGame, seed: int, games: int) -> List[BaseGame]:
+    """Returns every position of `games` random games from `game`."""
+    rnd_generator = random.Random(seed)
+    positions: List[BaseGame] = []
+    for _ in range(games):
+        position = game
+        positions.append(position)
+        while not position.is_game_over():
+            position = position.make_move(rnd_generator.choice(position.get_legal_moves()))
+            positions.append(position)
+    return positions
+
+
+def describe(game: BaseGame) -> Tuple[int, int, int, List[int], int | None]:
+    """The key, hash, player to move, legal moves and winner of a position, as seen by the process calling it."""
+    return game.state_key(), game.zobrist_hash, game.current_player, [int(move) for move in game.get_legal_moves()], game.get_winner()
+
+
+def test_state_key_round_trip():
+    for game in (GameTicTacToe(), GameConnect4(), GameConnect4(5, 6), GameOthello(), GameOthello(6)):
+        passes = 0
+        for position in random_positions(game, seed=5, games=10):
+            rebuilt = type(position).from_state_key(position.state_key(), *position.board_size())
+            assert rebuilt == position
+            assert describe(rebuilt) == describe(position)
+            assert rebuilt.empty_count == position.empty_count
+            assert rebuilt.variant_name == position.variant_name
+            assert rebuilt.last_move is None
+            if isinstance(position, GameOthello) and position.last_move is not None:
+                # After a pass, the player who just moved is to move again
+                passes += position.board[position.last_move] == position.current_player
+        if isinstance(game, GameOthello):
+            assert passes > 0, "the games should contain a pass"
+
+
+def test_pickle_round_trip():
+    for game in (GameTicTacToe(), GameConnect4(), GameOthello()):
+        for position in random_positions(game, seed=9, games=2):
+            unpickled = pickle.loads(pickle.dumps(position))
+            assert type(unpickled) is type(position)
+            assert unpickled == position and hash(unpickled) == hash(position)
+            assert describe(unpickled) == describe(position)
+
+
+def test_positions_pickled_to_worker_processes():
+    positions = [position for game in (GameTicTacToe(), GameConnect4(), GameOthello()) for position in random_positions(game, seed=13, games=1)]
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert list(executor.map(describe, positions)) == [describe(position) for position in positions]
+        # And back from the worker processes
+        assert list(executor.map(pickle.loads, [pickle.dumps(position) for position in positions])) == positions
+
+
+def play(game: BaseGame, moves: List[int]) -> BaseGame:
+    for move in moves:
+        game = game.make_move(Move.of(move))
+    return game
+
+
+def test_transpositions_are_equal_with_equal_hashes():
+    transpositions = [
+        (play(GameTicTacToe(), [0, 4, 1]), play(GameTicTacToe(), [1, 4, 0])),
+        (play(GameConnect4(), [0, 6, 2, 3]), play(GameConnect4(), [2, 3, 0, 6])),
+    ]
+    # Othello transpositions are found among the positions 4 plies deep
+    positions_by_key: Dict[int, BaseGame] = {}
+    positions = [GameOthello()]
+    for _ in range(4):
+        positions = [position.make_move(move) for position in positions for move in position.get_legal_moves()]
+    for position in positions:
+        if position.state_key() in positions_by_key:
+            transpositions.append((positions_by_key[position.state_key()], position))
+        positions_by_key[position.state_key()] = position
+    assert len(transpositions) > 2
+
+    for position, transposed in transpositions:
+        assert position is not transposed
+        assert position == transposed
+        assert hash(position) == hash(transposed)
+        assert len({position, transposed}) == 1
+
+    # The same discs with the other player to move, and the same key in another game or board size, are other positions
+    position = play(GameConnect4(), [0, 1, 3])
+    other_player = GameConnect4.from_state_key(position.state_key() ^ 1, *position.board_size())
+    assert other_player != position and hash(other_player) != hash(position)
+    assert GameConnect4(6, 7) != GameConnect4(5, 6)
+    assert GameTicTacToe() != GameConnect4()